@@ -2,7 +2,9 @@
 Entry point for the meme generation application.
 """
 
+import asyncio
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -13,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.config.settings import ConfigManager
 from src.core.image_generator import StableDiffusionGenerator
 from src.core.llm_client import OllamaClient
+from src.models.meme import MemeGenerationResult
 from src.services.caption_service import CaptionService
 from src.services.meme_service import MemeService
 from src.services.prompt_service import PromptService
@@ -47,9 +50,9 @@ def create_meme_service() -> MemeService:
     image_generator = StableDiffusionGenerator(config.stable_diffusion)
 
     # Create services
-    prompt_service = PromptService(llm_client)
-    caption_service = CaptionService(llm_client)
-    name_service = NameService(llm_client)
+    prompt_service = PromptService(llm_client, cache_size=config.llm_cache_size)
+    caption_service = CaptionService(llm_client, cache_size=config.llm_cache_size)
+    name_service = NameService(llm_client, cache_size=config.llm_cache_size)
 
     # Create utilities
     image_utils = ImageUtils(font_path=config.font_path)
@@ -62,9 +65,54 @@ def create_meme_service() -> MemeService:
         image_generator=image_generator,
         image_utils=image_utils,
         output_dir=config.output_dir,
+        cache_dir=config.cache_dir,
+        cache_max_entries=config.cache_max_entries,
     )
 
 
+def print_result(result: MemeGenerationResult) -> None:
+    """Prints a short summary of a generation result."""
+    if result.success:
+        print("\n✅ Meme created successfully!")
+        print(f"📝 Caption: {result.caption}")
+        print(f"🖼️File: {result.final_image_path}")
+        print(f"⏱️Time: {result.generation_time:.2f}s\n")
+    else:
+        print(f"\n❌ Error creating meme: {result.error_message}\n")
+
+
+async def generate_all(
+    meme_service: MemeService,
+    examples: list[str],
+    max_parallel: int | None = None,
+) -> list[MemeGenerationResult]:
+    """
+    Generates memes for all examples concurrently.
+
+    Every example runs in its own worker thread, so while one example waits
+    for Stable Diffusion the next one is already talking to the LLM.
+    At most max_parallel examples are in flight at a time, matching the
+    OLLAMA_NUM_PARALLEL setting of the Ollama server.
+
+    Args:
+        meme_service: Configured meme service
+        examples: Meme ideas to generate
+        max_parallel: Concurrency limit (default: OLLAMA_NUM_PARALLEL or 4)
+
+    Returns:
+        Generation results in the same order as examples
+    """
+    if max_parallel is None:
+        max_parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+    async def generate_one(example: str) -> MemeGenerationResult:
+        async with semaphore:
+            return await asyncio.to_thread(meme_service.generate_meme, example)
+
+    return await asyncio.gather(*(generate_one(example) for example in examples))
+
+
 def main():
     """Main function of the application."""
     logger = LoggerManager.get_logger(__name__)
@@ -79,19 +127,18 @@ def main():
         "компьютер и ежу понятен",
     ]
 
+    logger.info(f"Generating {len(examples)} memes concurrently")  # noqa: G004
+
     # Generate memes
-    for example in examples:
+    try:
+        results = asyncio.run(generate_all(meme_service, examples))
+    finally:
+        meme_service.close()
+    for example, result in zip(examples, results, strict=True):
         logger.info(f"\n{'=' * 60}")  # noqa: G004
-        logger.info(f"Generating meme for: {example}")  # noqa: G004
+        logger.info(f"Result for: {example}")  # noqa: G004
         logger.info(f"{'=' * 60}\n")  # noqa: G004
-        result = meme_service.generate_meme(example)
-        if result.success:
-            print("\n✅ Meme created successfully!")
-            print(f"📝 Caption: {result.caption}")
-            print(f"🖼️File: {result.final_image_path}")
-            print(f"⏱️Time: {result.generation_time:.2f}s\n")
-        else:
-            print(f"\n❌ Error creating meme: {result.error_message}\n")
+        print_result(result)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Follows OOP and IoC (Inversion of Control) principles.
 """
 
 import logging
+import os
 import uuid
 from typing import Annotated
 
@@ -11,6 +12,9 @@ from fastapi import Depends, Header
 
 from src.config.logging_config import get_logger
 from src.config.settings import ConfigManager
+from src.core.llm_client import OllamaClient
+from src.services.caption_service import CaptionForImageService
+from src.services.memegen_service import MemeGenerator
 
 logger = get_logger(__name__)
 
@@ -19,6 +23,7 @@ class DependencyProvider:
     """Dependency provider for FastAPI."""
 
     _config: ConfigManager | None = None
+    _meme_generator: MemeGenerator | None = None
 
     @classmethod
     def get_config(cls) -> ConfigManager:
@@ -33,6 +38,29 @@ class DependencyProvider:
             logger.info("ConfigManager initialized")
         return cls._config
 
+    @classmethod
+    def get_meme_generator(cls) -> MemeGenerator:
+        """
+        Get singleton instance of MemeGenerator.
+
+        Created on first use rather than at import, so importing the
+        routers does not set up the Ollama client. The client and its
+        connection pool are then shared by all requests.
+
+        Returns:
+            MemeGenerator for memegen.link templates
+        """
+        if cls._meme_generator is None:
+            ollama_host = os.getenv("OLLAMA_HOST", "http://ollama:11434")
+            model_name = os.getenv("OLLAMA_MODEL", "alibayram/smollm3")
+            ollama_client = OllamaClient(model_name, 30)
+            cls._meme_generator = MemeGenerator(
+                ollama_url=ollama_host,
+                caption_service=CaptionForImageService(ollama_client),
+            )
+            logger.info("MemeGenerator initialized")
+        return cls._meme_generator
+
     @classmethod
     def get_logger_for_request(cls, request_id: str) -> logging.Logger:
         """
@@ -52,6 +80,10 @@ class DependencyProvider:
 
 # Convenient aliases for use in routers
 ConfigDep = Annotated[ConfigManager, Depends(DependencyProvider.get_config)]
+MemeGeneratorDep = Annotated[
+    MemeGenerator,
+    Depends(DependencyProvider.get_meme_generator),
+]
 
 
 async def verify_api_key(
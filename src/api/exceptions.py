@@ -67,11 +67,13 @@ class ImageNotFoundException(MemeAPIException):
 class InvalidStyleException(MemeAPIException):
     """Specified style does not exist."""
 
-    def __init__(self, style: str, available_styles: list):
+    def __init__(self, style: str, available_styles: list | tuple | str):
+        # Callers on a hot path may pass the already joined list
+        if not isinstance(available_styles, str):
+            available_styles = ", ".join(available_styles)
         super().__init__(
             detail=(
-                f"Style '{style}' not found. "
-                f"Available styles: {', '.join(available_styles)}"
+                f"Style '{style}' not found. Available styles: {available_styles}"
             ),
             status_code=status.HTTP_400_BAD_REQUEST,
             error_code="INVALID_STYLE",
@@ -6,12 +6,23 @@ Entry point for the API server.
 import time
 from contextlib import asynccontextmanager
 
+import aiohttp
 from fastapi import FastAPI, Request, status
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from src.api.exceptions import MemeAPIException
+from src.api.dependencies import DependencyProvider
+from src.api.exceptions import InvalidStyleException, MemeAPIException
 from src.api.routers import health, internal, memes
+from src.api.routers.health import (
+    ServiceHealthChecker,
+    create_redis_client,
+    load_probe_timeouts,
+)
+from src.api.routers.memes import create_result_backend_client
+from src.api.schemas import STYLE_NAMES_TEXT
 from src.config.logging_config import LoggingConfigurator, get_logger
 
 # Initialize logging
@@ -30,13 +41,43 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Memology ML API")
     logger.info("=" * 60)
 
-    # Add initialization of connections, caches, etc. here
-    # For example, checking availability of Redis, Ollama, Stable Diffusion
+    # Load configuration once; this also creates the directory for
+    # results uploaded by workers (output_dir)
+    config = DependencyProvider.get_config()
+    config.load_config()
+    if not internal.WORKER_SECRET_TOKEN:
+        logger.warning("WORKER_SECRET_TOKEN is not set, worker uploads are disabled")
+
+    # Shared HTTP session for health checks (keeps connections alive)
+    app.state.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            keepalive_timeout=30,
+            ttl_dns_cache=300,
+        ),
+        timeout=aiohttp.ClientTimeout(total=5),
+    )
+    # Shared Redis connection pool for health checks
+    app.state.redis = create_redis_client()
+    # Async client for polling task results (None for non-Redis backends)
+    app.state.result_redis = create_result_backend_client()
+    # Health checker is stateless apart from the shared resources above
+    app.state.health_checker = ServiceHealthChecker(
+        config,
+        app.state.http_session,
+        app.state.redis,
+        timeouts=load_probe_timeouts(),
+    )
 
     yield
 
     # Shutdown
     logger.info("Shutting down Memology ML API")
+    await app.state.http_session.close()
+    await app.state.redis.aclose()
+    if app.state.result_redis is not None:
+        await app.state.result_redis.aclose()
 
 
 # Create FastAPI application
@@ -48,6 +89,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -106,6 +148,28 @@ async def meme_api_exception_handler(request: Request, exc: MemeAPIException):
     )
 
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(
+    request: Request,
+    exc: RequestValidationError,
+):
+    """
+    Handler for request validation errors.
+    An unknown meme style keeps its dedicated INVALID_STYLE error.
+    """
+    for error in exc.errors():
+        loc = error["loc"]
+        # ("body", "style") or ("body", "items", <index>, "style") for batches
+        if loc[0] == "body" and loc[-1] == "style":
+            logger.warning(f"Invalid style requested: {error['input']}")  # noqa: G004
+            return await meme_api_exception_handler(
+                request,
+                InvalidStyleException(error["input"], STYLE_NAMES_TEXT),
+            )
+
+    return await request_validation_exception_handler(request, exc)
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """
@@ -145,6 +209,7 @@ async def root():
         "health": "/health",
         "endpoints": {
             "generate_meme": "POST /api/memes/generate",
+            "generate_meme_batch": "POST /api/memes/generate/batch",
             "get_task_status": "GET /api/memes/task/{task_id}",
             "get_meme_result": "GET /api/memes/task/{task_id}/result",
             "available_styles": "GET /api/memes/styles",
@@ -7,21 +7,171 @@ Implements comprehensive health checks for external dependencies:
 """
 
 import asyncio
+import functools
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import Annotated, Any, ClassVar
 
 import aiohttp
-from fastapi import APIRouter, Response, status
+import orjson
+from fastapi import APIRouter, Depends, Request, Response, status
 from redis import asyncio as aioredis
 
-from src.api.dependencies import ConfigDep
 from src.api.schemas import HealthResponse
 from src.config.logging_config import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/health", tags=["Health"])
 
+SERVICE_NAME = "memology-ml-api"
+SERVICE_VERSION = "1.0.0"
+
+# External services checked by the readiness probe, in response order
+SERVICES = ("redis", "ollama", "stable_diffusion")
+
+
+_timestamp_cache: tuple[int, str] = (0, "")
+
+
+def _utc_now_iso() -> str:
+    """
+    Current UTC time in ISO format with one-second resolution.
+
+    The formatted string is reused for every call within the same second,
+    which is plenty for health check timestamps.
+    """
+    global _timestamp_cache  # noqa: PLW0603
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (
+            now,
+            datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+        )
+    return _timestamp_cache[1]
+
+
+def _prebuild_health_body(status_value: str) -> bytes:
+    """Serialize the constant part of a HealthResponse, leaving the object open."""
+    body = orjson.dumps(
+        {"status": status_value, "service": SERVICE_NAME, "version": SERVICE_VERSION},
+    )
+    return body[:-1] + b',"timestamp":"'
+
+
+_HEALTHY_BODY_PREFIX = _prebuild_health_body("healthy")
+_ALIVE_BODY_PREFIX = _prebuild_health_body("alive")
+
+
+def _json_response(content: dict[str, Any], status_code: int = 200) -> Response:
+    """
+    Serialize a probe payload with orjson and skip FastAPI's encoder.
+
+    The payloads are plain dicts of str/int values, so jsonable_encoder
+    and response_model validation would only add overhead.
+    """
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _health_response(body_prefix: bytes) -> Response:
+    """
+    Build a HealthResponse-shaped JSON response from a prebuilt body.
+
+    Only the timestamp is serialized per request; Pydantic validation
+    and JSON encoding of the constant fields are skipped.
+    """
+    return Response(
+        content=body_prefix + _utc_now_iso().encode() + b'"}',
+        media_type="application/json",
+    )
+
+
+def _async_cached(ttl_seconds: float):
+    """
+    Cache the result of an async method for a short time.
+
+    The cache is shared by all instances of the class. Concurrent callers
+    with the same arguments wait for a single in-flight computation instead
+    of starting their own; calls with other arguments are not blocked.
+
+    Args:
+        ttl_seconds: How long a result stays valid
+
+    Returns:
+        Decorator for async methods with hashable arguments
+    """
+
+    def decorator(func):
+        cache: dict[tuple, tuple[float, Any]] = {}
+        # One lock per argument set, so a slow probe for one key does not
+        # stall callers of another
+        locks: dict[tuple, asyncio.Lock] = {}
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = asyncio.Lock()
+            async with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    return entry[1]
+                value = await func(self, *args, **kwargs)
+                cache[key] = (time.monotonic() + ttl_seconds, value)
+                return value
+
+        return wrapper
+
+    return decorator
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Circuit breaker for a single external service.
+
+    After failure_threshold consecutive failures the circuit opens and probes
+    are skipped until recovery_timeout seconds have passed. The next probe is
+    then let through (half-open): success closes the circuit, failure opens
+    it again.
+    """
+
+    failure_threshold: int = 3
+    recovery_timeout: float = 30.0
+    failure_count: int = 0
+    opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.recovery_timeout:
+            return "open"
+        return "half_open"
+
+    def allow_request(self) -> bool:
+        """Whether the service should actually be probed."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful probe."""
+        self.failure_count = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed probe and open the circuit when the threshold is hit."""
+        self.failure_count += 1
+        if self.failure_count >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
 
 class ServiceHealthChecker:
     """
@@ -29,15 +179,55 @@ class ServiceHealthChecker:
     Follows OOP principles and encapsulates health check logic.
     """
 
-    def __init__(self, config):
+    # Shared between checker instances so breaker state survives requests
+    breakers: ClassVar[dict[str, CircuitBreaker]] = {
+        "redis": CircuitBreaker(),
+        "ollama": CircuitBreaker(),
+        "stable_diffusion": CircuitBreaker(),
+    }
+
+    # Probe budgets in seconds; kept well below the k8s probe timeout
+    DEFAULT_TIMEOUTS: ClassVar[dict[str, float]] = {
+        "redis": 1.0,
+        "ollama": 2.0,
+        "stable_diffusion": 3.0,
+    }
+
+    def __init__(
+        self,
+        config,
+        session: aiohttp.ClientSession,
+        redis_client: aioredis.Redis,
+        timeouts: dict[str, float] | None = None,
+    ):
         """
         Initialize the health checker with configuration.
 
         Args:
             config: Application configuration with service URLs
+            session: Shared HTTP session used for the Ollama and SD probes
+            redis_client: Shared Redis client (connection pool) for the Redis probe
+            timeouts: Per-service probe timeouts in seconds, overriding
+                DEFAULT_TIMEOUTS
         """
         self.config = config
-        self.timeout = 5  # seconds
+        self.session = session
+        self.redis_client = redis_client
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+
+        # Resolve probe URLs once instead of on every check
+        ollama_url = self._get_config_value(
+            "OLLAMA_HOST",
+            "OLLAMA_HOST",
+            "http://host.docker.internal:11434",
+        )
+        sd_url = self._get_config_value(
+            "sd_base_url",
+            "SD_BASE_URL",
+            "http://host.docker.internal:7860",
+        )
+        self.ollama_tags_url = f"{ollama_url}/api/tags"
+        self.sd_options_url = f"{sd_url}/sdapi/v1/options"
 
     def _get_config_value(self, attr_name: str, env_var: str, default: str) -> str:
         """
@@ -62,34 +252,31 @@ class ServiceHealthChecker:
         # If not found, use default
         return default
 
-    async def check_redis(self) -> dict[str, Any]:
+    async def check_redis(self, detailed: bool = False) -> dict[str, Any]:
         """
         Check Redis connection and availability.
 
+        Args:
+            detailed: Also fetch server info (version, uptime) via INFO.
+                A plain PING is enough for readiness probes.
+
         Returns:
             Dictionary with status and details
         """
         try:
-            redis_url = self._get_config_value(
-                "celery_broker_url",
-                "CELERY_BROKER_URL",
-                "redis://redis:6379/0",
-            )
-
-            # Create Redis client
-            redis_client = await aioredis.from_url(
-                redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-            )
-
             # Try to ping Redis
-            await asyncio.wait_for(redis_client.ping(), timeout=self.timeout)
+            async with asyncio.timeout(self.timeouts["redis"]):
+                await self.redis_client.ping()
 
-            # Get some info
-            info = await redis_client.info("server")
+            if not detailed:
+                return {
+                    "status": "healthy",
+                    "message": "Redis is available",
+                    "details": {},
+                }
 
-            await redis_client.close()
+            # Get some info
+            info = await self.redis_client.info("server")
 
             return {
                 "status": "healthy",
@@ -114,52 +301,57 @@ class ServiceHealthChecker:
                 "details": {},
             }
 
-    async def check_ollama(self) -> dict[str, Any]:
+    async def check_ollama(self, detailed: bool = False) -> dict[str, Any]:
         """
         Check Ollama API availability.
 
+        Args:
+            detailed: Parse the model list into the details. Without it only
+                the HTTP status is checked and the body is not decoded.
+
         Returns:
             Dictionary with status and details
         """
         try:
-            ollama_url = self._get_config_value(
-                "OLLAMA_HOST",
-                "OLLAMA_HOST",
-                "http://host.docker.internal:11434",
-            )
-
-            async with aiohttp.ClientSession() as session:
-                try:
-                    response = await asyncio.wait_for(
-                        session.get(f"{ollama_url}/api/tags"),
-                        timeout=self.timeout,
-                    )
-                    async with response:
-                        if response.status == status.HTTP_200_OK:
-                            data = await response.json()
-                            models = data.get("models", [])
-                            model_names = [m.get("name", "unknown") for m in models]
-
-                            return {
-                                "status": "healthy",
-                                "message": "Ollama is available",
-                                "details": {
-                                    "models_count": len(models),
-                                    "available_models": model_names[:3],  # First 3
-                                },
-                            }
-                        return {
-                            "status": "unhealthy",
-                            "message": f"Ollama returned status {response.status}",
-                            "details": {},
-                        }
-                except asyncio.TimeoutError:
-                    logger.exception("Ollama health check timed out")
+            async with (
+                asyncio.timeout(self.timeouts["ollama"]),
+                self.session.get(self.ollama_tags_url) as response,
+            ):
+                if response.status != status.HTTP_200_OK:
                     return {
                         "status": "unhealthy",
-                        "message": "Ollama connection timeout",
+                        "message": f"Ollama returned status {response.status}",
+                        "details": {},
+                    }
+
+                if not detailed:
+                    # Drain the body so the connection goes back to the pool
+                    await response.read()
+                    return {
+                        "status": "healthy",
+                        "message": "Ollama is available",
                         "details": {},
                     }
+
+                data = await response.json(loads=orjson.loads)
+                models = data.get("models", [])
+                model_names = [m.get("name", "unknown") for m in islice(models, 3)]
+
+                return {
+                    "status": "healthy",
+                    "message": "Ollama is available",
+                    "details": {
+                        "models_count": len(models),
+                        "available_models": model_names,  # First 3
+                    },
+                }
+        except asyncio.TimeoutError:
+            logger.exception("Ollama health check timed out")
+            return {
+                "status": "unhealthy",
+                "message": "Ollama connection timeout",
+                "details": {},
+            }
         except Exception as e:
             logger.exception("Ollama health check failed", extra={"error": str(e)})
             return {
@@ -168,49 +360,54 @@ class ServiceHealthChecker:
                 "details": {},
             }
 
-    async def check_stable_diffusion(self) -> dict[str, Any]:
+    async def check_stable_diffusion(self, detailed: bool = False) -> dict[str, Any]:
         """
         Check Stable Diffusion WebUI API availability.
 
+        Args:
+            detailed: Parse the options to report the loaded checkpoint.
+                Without it only the HTTP status is checked.
+
         Returns:
             Dictionary with status and details
         """
         try:
-            sd_url = self._get_config_value(
-                "sd_base_url",
-                "SD_BASE_URL",
-                "http://host.docker.internal:7860",
-            )
-
-            async with aiohttp.ClientSession() as session:
-                try:
-                    response = await asyncio.wait_for(
-                        session.get(f"{sd_url}/sdapi/v1/options"),
-                        timeout=self.timeout,
-                    )
-                    async with response:
-                        if response.status == status.HTTP_200_OK:
-                            data = await response.json()
-
-                            return {
-                                "status": "healthy",
-                                "message": "Stable Diffusion WebUI is available",
-                                "details": {
-                                    "model": data.get("sd_model_checkpoint", "unknown"),
-                                },
-                            }
-                        return {
-                            "status": "unhealthy",
-                            "message": f"SD WebUI returned status {response.status}",
-                            "details": {},
-                        }
-                except asyncio.TimeoutError:
-                    logger.exception("Stable Diffusion health check timed out")
+            async with (
+                asyncio.timeout(self.timeouts["stable_diffusion"]),
+                self.session.get(self.sd_options_url) as response,
+            ):
+                if response.status != status.HTTP_200_OK:
                     return {
                         "status": "unhealthy",
-                        "message": "Stable Diffusion connection timeout",
+                        "message": f"SD WebUI returned status {response.status}",
+                        "details": {},
+                    }
+
+                if not detailed:
+                    # Drain the body so the connection goes back to the pool
+                    await response.read()
+                    return {
+                        "status": "healthy",
+                        "message": "Stable Diffusion WebUI is available",
                         "details": {},
                     }
+
+                data = await response.json(loads=orjson.loads)
+
+                return {
+                    "status": "healthy",
+                    "message": "Stable Diffusion WebUI is available",
+                    "details": {
+                        "model": data.get("sd_model_checkpoint", "unknown"),
+                    },
+                }
+        except asyncio.TimeoutError:
+            logger.exception("Stable Diffusion health check timed out")
+            return {
+                "status": "unhealthy",
+                "message": "Stable Diffusion connection timeout",
+                "details": {},
+            }
         except Exception as e:
             logger.exception(
                 "Stable Diffusion health check failed",
@@ -222,36 +419,141 @@ class ServiceHealthChecker:
                 "details": {},
             }
 
-    async def check_all_services(self) -> dict[str, Any]:
+    async def _run_check(self, service: str, check) -> dict[str, Any]:
+        """
+        Run a single probe behind its circuit breaker.
+
+        Unexpected errors are turned into an unhealthy result. While the
+        circuit is open the probe is skipped and an unhealthy result is
+        returned immediately.
+
+        Args:
+            service: Service name (key in breakers)
+            check: Bound probe coroutine function (e.g. self.check_redis)
+
+        Returns:
+            Probe result dictionary
+        """
+        breaker = self.breakers[service]
+        if not breaker.allow_request():
+            return {
+                "status": "unhealthy",
+                "message": "Circuit open, skipping check",
+                "details": {"failure_count": breaker.failure_count},
+            }
+
+        try:
+            result = await check()
+        # CancelledError is a BaseException and is deliberately not caught
+        # here, so a cancelled probe is not reported as "unhealthy"
+        except Exception as e:
+            logger.exception("Health check %s crashed", service)
+            result = {"status": "unhealthy", "message": str(e), "details": {}}
+
+        if result["status"] == "healthy":
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return result
+
+    @_async_cached(ttl_seconds=3)
+    async def check_all_services(self, detailed: bool = False) -> dict[str, Any]:
         """
         Check all external services in parallel.
 
+        Results are cached for a few seconds so frequent probes
+        (k8s, Prometheus) do not hit every backend on each request.
+
+        Args:
+            detailed: Collect monitoring details (Redis server info, Ollama
+                models, SD checkpoint) in addition to the availability check
+
         Returns:
             Dictionary with results for all services
         """
-        results = await asyncio.gather(
-            self.check_redis(),
-            self.check_ollama(),
-            self.check_stable_diffusion(),
-            return_exceptions=True,
-        )
+        probes = (self.check_redis, self.check_ollama, self.check_stable_diffusion)
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(
+                    self._run_check(name, functools.partial(probe, detailed=detailed)),
+                )
+                for name, probe in zip(SERVICES, probes, strict=True)
+            ]
+
+        return dict(zip(SERVICES, (task.result() for task in tasks), strict=True))
+
+    @classmethod
+    def circuit_states(cls) -> dict[str, str]:
+        """
+        Get the circuit breaker state of every service.
+
+        Returns:
+            Mapping of service name to breaker state
+        """
+        return {name: breaker.state for name, breaker in cls.breakers.items()}
+
 
-        return {
-            "redis": results[0]
-            if not isinstance(results[0], Exception)
-            else {"status": "unhealthy", "message": str(results[0]), "details": {}},
-            "ollama": results[1]
-            if not isinstance(results[1], Exception)
-            else {"status": "unhealthy", "message": str(results[1]), "details": {}},
-            "stable_diffusion": results[2]
-            if not isinstance(results[2], Exception)
-            else {"status": "unhealthy", "message": str(results[2]), "details": {}},
-        }
+def create_redis_client() -> aioredis.Redis:
+    """
+    Create the app-scoped Redis client used by the health checks.
+
+    The client owns a small connection pool that is reused by every probe.
+
+    Returns:
+        Redis client for the Celery broker
+    """
+    redis_url = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
+    return aioredis.from_url(
+        redis_url,
+        encoding="utf-8",
+        decode_responses=True,
+        max_connections=10,
+        socket_timeout=5,
+        socket_keepalive=True,
+    )
+
+
+# Environment variables overriding ServiceHealthChecker.DEFAULT_TIMEOUTS
+TIMEOUT_ENV_VARS = {
+    "redis": "HEALTH_TIMEOUT_REDIS",
+    "ollama": "HEALTH_TIMEOUT_OLLAMA",
+    "stable_diffusion": "HEALTH_TIMEOUT_SD",
+}
+
+
+def load_probe_timeouts() -> dict[str, float]:
+    """
+    Read per-service probe timeout overrides from the environment.
+
+    Returns:
+        Timeouts in seconds for the services whose variable is set
+    """
+    return {
+        service: float(value)
+        for service, env_var in TIMEOUT_ENV_VARS.items()
+        if (value := os.getenv(env_var))
+    }
+
+
+def get_health_checker(request: Request) -> ServiceHealthChecker:
+    """
+    Get the app-scoped health checker created in the lifespan.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Shared ServiceHealthChecker instance
+    """
+    return request.app.state.health_checker
+
+
+HealthCheckerDep = Annotated[ServiceHealthChecker, Depends(get_health_checker)]
 
 
 @router.get("", response_model=HealthResponse)
 @router.get("/", response_model=HealthResponse, include_in_schema=False)
-async def health_check(config: ConfigDep) -> HealthResponse:
+async def health_check() -> Response:
     """
     Basic health check endpoint (liveness probe).
     Returns OK if the API server itself is running.
@@ -262,19 +564,11 @@ async def health_check(config: ConfigDep) -> HealthResponse:
     """
     logger.debug("Health check requested")
 
-    return HealthResponse(
-        status="healthy",
-        service="memology-ml-api",
-        version="1.0.0",
-        timestamp=datetime.now(tz=timezone.utc),
-    )
+    return _health_response(_HEALTHY_BODY_PREFIX)
 
 
-@router.get("/ready", response_model=dict)
-async def readiness_check(
-    response: Response,
-    config: ConfigDep,
-) -> dict[str, Any]:
+@router.get("/ready")
+async def readiness_check(checker: HealthCheckerDep) -> Response:
     """
     Comprehensive readiness check endpoint.
     Checks availability of all external services (Redis, Ollama, Stable Diffusion).
@@ -283,17 +577,13 @@ async def readiness_check(
     Returns HTTP 503 if any service is unhealthy.
 
     Args:
-        response: FastAPI Response object to set status code
-        config: Application configuration (DI)
+        checker: Shared service health checker (DI)
 
     Returns:
         Detailed information about service readiness
     """
     logger.debug("Readiness check requested")
 
-    # Create health checker
-    checker = ServiceHealthChecker(config)
-
     # Check all services in parallel
     services_status = await checker.check_all_services()
 
@@ -317,19 +607,20 @@ async def readiness_check(
             unhealthy_services,
         )
 
-    response.status_code = status_code
-
-    return {
-        "status": overall_status,
-        "service": "memology-ml-api",
-        "version": "1.0.0",
-        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
-        "services": services_status,
-    }
+    return _json_response(
+        {
+            "status": overall_status,
+            "service": SERVICE_NAME,
+            "version": SERVICE_VERSION,
+            "timestamp": _utc_now_iso(),
+            "services": services_status,
+        },
+        status_code=status_code,
+    )
 
 
 @router.get("/live", response_model=HealthResponse)
-async def liveness_check(config: ConfigDep) -> HealthResponse:
+async def liveness_check() -> Response:
     """
     Liveness probe endpoint (Kubernetes-style).
     Returns OK if the application is alive and not deadlocked.
@@ -340,32 +631,29 @@ async def liveness_check(config: ConfigDep) -> HealthResponse:
     """
     logger.debug("Liveness check requested")
 
-    return HealthResponse(
-        status="alive",
-        service="memology-ml-api",
-        version="1.0.0",
-        timestamp=datetime.now(tz=timezone.utc),
-    )
+    return _health_response(_ALIVE_BODY_PREFIX)
 
 
-@router.get("/services", response_model=dict)
-async def services_status(config: ConfigDep) -> dict[str, Any]:
+@router.get("/services")
+async def services_status(checker: HealthCheckerDep) -> Response:
     """
     Detailed status of all external services.
     Useful for monitoring and debugging.
 
     Args:
-        config: Application configuration (DI)
+        checker: Shared service health checker (DI)
 
     Returns:
         Detailed status of each service
     """
     logger.debug("Services status check requested")
 
-    checker = ServiceHealthChecker(config)
-    services_status = await checker.check_all_services()
+    services_status = await checker.check_all_services(detailed=True)
 
-    return {
-        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
-        "services": services_status,
-    }
+    return _json_response(
+        {
+            "timestamp": _utc_now_iso(),
+            "services": services_status,
+            "circuit_breakers": ServiceHealthChecker.circuit_states(),
+        },
+    )
@@ -1,36 +1,47 @@
+import hmac
 import os
-import shutil
+import re
 from pathlib import Path
 
+import aiofiles
 from fastapi import APIRouter, File, Header, HTTPException, UploadFile, status
 
-from src.config.settings import ConfigManager
+from src.api.dependencies import ConfigDep
 
 router = APIRouter(prefix="/internal", tags=["Internal"], include_in_schema=False)
 
-config_manager = ConfigManager()
-app_config = config_manager.load_config()
-
 WORKER_SECRET_TOKEN = os.getenv("WORKER_SECRET_TOKEN")
-UPLOAD_DIR = Path(app_config.output_dir)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+SAFE_FILENAME_RE = re.compile(r"[A-Za-z0-9._-]{1,128}")
 
 
 @router.post("/upload/{task_id}", status_code=status.HTTP_201_CREATED)
 async def upload_meme_result(
     task_id: str,
+    config: ConfigDep,
     file: UploadFile = File(...),
     x_worker_token: str | None = Header(None),
 ):
     """Принимает сгенерированное изображение от воркера."""
-    if x_worker_token != WORKER_SECRET_TOKEN:
+    # Constant-time comparison; an unset token on the server rejects everything
+    if not (
+        WORKER_SECRET_TOKEN
+        and x_worker_token
+        and hmac.compare_digest(x_worker_token.encode(), WORKER_SECRET_TOKEN.encode())
+    ):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid worker token")
 
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    file_path = UPLOAD_DIR / file.filename
+    # Never trust the client-supplied name: keep only a plain file name
+    safe_name = Path(file.filename or "").name
+    if not SAFE_FILENAME_RE.fullmatch(safe_name) or safe_name.startswith("."):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file name")
+
+    file_path = Path(config.config.output_dir) / safe_name
 
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
     finally:
         await file.close()
 
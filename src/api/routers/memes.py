@@ -3,53 +3,119 @@ Endpoints for meme generation.
 Follow REST API principles and asynchronous processing.
 """
 
+import asyncio
 import os
+import stat
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Annotated, Any
+from uuid import UUID, uuid4
 
+import orjson
+from celery import group
 from celery.app.control import Inspect
-from celery.result import AsyncResult
-from fastapi import APIRouter, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import FileResponse, ORJSONResponse
+from redis import asyncio as aioredis
 
-from src.api.dependencies import ConfigDep, RequestIDDep
+from src.api.dependencies import MemeGeneratorDep, RequestIDDep
 from src.api.exceptions import (
     ImageNotFoundException,
-    InvalidStyleException,
     TaskFailedException,
     TaskNotFoundException,
     TaskStillProcessingException,
 )
 from src.api.schemas import (
+    MemeGenerationBatchRequest,
     MemeGenerationRequest,
-    MemeGenerationResult,
     MemegenRequest,
     MemegenResponse,
-    TaskProgressInfo,
+    TaskBatchResponse,
     TaskResponse,
     TaskStatus,
     TaskStatusResponse,
 )
 from src.config.logging_config import get_logger
-from src.core.llm_client import OllamaClient
 from src.models.meme import PREDEFINED_STYLES
-from src.services.caption_service import CaptionForImageService
-from src.services.memegen_service import MemeGenerator
 from src.worker.celery_app import celery_app
 from src.worker.tasks import generate_meme_task
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/memes", tags=["Memes"])
-ollama_host = os.getenv("OLLAMA_HOST", "http://ollama:11434")
-model_name = os.getenv("OLLAMA_MODEL", "alibayram/smollm3")
-ollama_client = OllamaClient(model_name, 30)
 
+@dataclass(slots=True, frozen=True)
+class _TaskProgress:
+    """TaskProgressInfo payload; orjson serializes it like the model."""
 
-meme_generator = MemeGenerator(
-    ollama_url=ollama_host,
-    caption_service=CaptionForImageService(ollama_client),
+    current: int
+    total: int
+    status: str
+
+
+# Fixed progress payloads, shared by every poll in these states
+_PENDING_PROGRESS = _TaskProgress(0, 4, "Task is waiting in the queue")
+_RETRY_PROGRESS = _TaskProgress(0, 4, "Retrying generation...")
+
+# Raw Celery state string -> TaskStatus, avoids the Enum(value) lookup per poll
+_STATE_TO_ENUM = {task_status.value: task_status for task_status in TaskStatus}
+_IN_PROGRESS_STATES = frozenset(
+    (TaskStatus.PENDING, TaskStatus.STARTED, TaskStatus.RETRY),
+)
+
+# Finished tasks never change state, so their metadata is kept in-process
+# for a while and repeated polls skip the result backend
+_TERMINAL_STATES = frozenset(
+    (TaskStatus.SUCCESS, TaskStatus.FAILURE, TaskStatus.REVOKED),
+)
+TASK_META_CACHE_TTL = 60.0  # seconds
+TASK_META_CACHE_SIZE = 1024
+_task_meta_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+# Worker stats are broadcast over the broker; reuse them for a few seconds
+TASK_STATS_TTL = 3.0  # seconds
+_task_stats_cache: dict[str, Any] = {"expires_at": 0.0, "value": None}
+
+# Styles never change at runtime, so the /styles body is serialized once
+_STYLES_JSON = orjson.dumps(
+    [
+        {"name": style.name, "description": style.description}
+        for style in PREDEFINED_STYLES
+    ],
 )
 
 
+def create_result_backend_client() -> aioredis.Redis | None:
+    """
+    Create an async client for reading task results straight from Redis.
+
+    Returns:
+        Redis client for the Celery result backend, or None if the backend
+        is not Redis (task metadata is then read through Celery)
+    """
+    backend_url = celery_app.conf.result_backend or ""
+    if not backend_url.startswith(("redis://", "rediss://")):
+        return None
+    return aioredis.from_url(backend_url, max_connections=20)
+
+
+def get_result_backend(request: Request) -> aioredis.Redis | None:
+    """
+    Get the app-scoped result backend client created in the lifespan.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Redis client or None
+    """
+    return request.app.state.result_redis
+
+
+ResultBackendDep = Annotated[aioredis.Redis | None, Depends(get_result_backend)]
+
+
 @router.post(
     "/generate-template",
     response_model=MemegenResponse,
@@ -63,7 +129,7 @@ meme_generator = MemeGenerator(
 async def generate_meme_with_memegen(
     request: MemegenRequest,
     request_id: RequestIDDep,
-    config: ConfigDep,
+    meme_generator: MemeGeneratorDep,
 ) -> MemegenResponse:
     """
     Generate a meme using memegen.link API with LLM captions.
@@ -76,7 +142,7 @@ async def generate_meme_with_memegen(
     Args:
         request: Request with context and optional parameters
         request_id: Unique request ID (DI)
-        config: Application configuration (DI)
+        meme_generator: Shared memegen.link generator (DI)
 
     Returns:
         MemegenResponse with URL and metadata
@@ -109,8 +175,10 @@ async def generate_meme_with_memegen(
     )
 
     try:
-        # Генерируем мем с помощью MemeGenerator
-        result = meme_generator.generate_meme(
+        # Генерируем мем с помощью MemeGenerator (блокирующий вызов LLM,
+        # выполняется в потоке, чтобы не блокировать event loop)
+        result = await asyncio.to_thread(
+            meme_generator.generate_meme,
             context=request.context,
             width=request.width,
             height=request.height,
@@ -150,21 +218,20 @@ async def generate_meme_with_memegen(
 async def generate_meme(
     request: MemeGenerationRequest,
     request_id: RequestIDDep,
-    config: ConfigDep,
-) -> TaskResponse:
+) -> ORJSONResponse:
     """
     Create a meme generation task.
 
     Args:
         request: Request with meme description
-        config: Application configuration (DI)
         request_id: Unique request ID (DI)
 
     Returns:
         Information about the created task with task_id
 
-    Raises:
-        InvalidStyleException: If a non-existent style is specified
+    Note:
+        Unknown styles are rejected by MemeGenerationRequest validation
+        and reported as InvalidStyleException by the app.
     """
 
     logger.info(
@@ -174,51 +241,108 @@ async def generate_meme(
         extra={"request_id": request_id},
     )
 
-    # Validate style if specified
-    if request.style:
-        available_styles = [s.name for s in PREDEFINED_STYLES]
-        if request.style not in available_styles:
-            logger.warning(
-                "Invalid style requested: %s",
-                request.style,
-                extra={"request_id": request_id},
-            )
-            raise InvalidStyleException(request.style, available_styles)
+    # Use request_id as task_id for tracing. Task ids must be canonical
+    # UUIDs, since the status endpoints only accept those
+    try:
+        task_id = str(UUID(request_id))
+    except ValueError:
+        task_id = str(uuid4())
 
     # Send task to Celery
     task = generate_meme_task.apply_async(
         args=[request.user_input, request.style],
-        task_id=request_id,  # Use request_id as task_id for tracing
+        task_id=task_id,
     )
 
     logger.info("Task created", extra={"request_id": request_id, "task_id": task.id})
 
-    return TaskResponse(
-        task_id=task.id,
-        status="queued",
-        message="Task added to queue. Use task_id to check status.",
+    return ORJSONResponse(
+        {
+            "task_id": task.id,
+            "status": "queued",
+            "message": "Task added to queue. Use task_id to check status.",
+        },
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.post(
+    "/generate/batch",
+    response_model=TaskBatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Create several meme generation tasks",
+    description=(
+        "Creates one task per item in a single broker round trip and returns "
+        "their task_ids"
+    ),
+)
+async def generate_meme_batch(
+    batch: MemeGenerationBatchRequest,
+    request_id: RequestIDDep,
+) -> ORJSONResponse:
+    """
+    Create meme generation tasks for a batch of requests.
+
+    All tasks are published as one Celery group, which reuses a single
+    producer connection instead of one publish per request.
+
+    Args:
+        batch: Meme generation requests
+        request_id: Unique request ID (DI)
+
+    Returns:
+        Information about the created tasks, in request order
+    """
+
+    logger.info(
+        "Received meme generation batch: size=%d",
+        len(batch.items),
+        extra={"request_id": request_id},
+    )
+
+    signatures = group(
+        generate_meme_task.s(item.user_input, item.style) for item in batch.items
+    )
+    # Publishing is blocking I/O, keep it off the event loop
+    group_result = await asyncio.to_thread(signatures.apply_async)
+    task_ids = [result.id for result in group_result.results]
+
+    logger.info(
+        "Batch tasks created",
+        extra={"request_id": request_id, "task_ids": task_ids},
+    )
+
+    return ORJSONResponse(
+        {
+            "tasks": [
+                {
+                    "task_id": task_id,
+                    "status": "queued",
+                    "message": "Task added to queue. Use task_id to check status.",
+                }
+                for task_id in task_ids
+            ],
+        },
+        status_code=status.HTTP_202_ACCEPTED,
     )
 
 
 @router.get(
     "/styles",
-    response_model=list[dict],
+    response_class=Response,
     summary="Get a list of available styles",
     description="Returns all available meme visualization styles",
 )
-async def get_available_styles() -> list[dict]:
+async def get_available_styles() -> Response:
     """
     Get a list of all available styles.
 
     Returns:
-        List of styles with names and descriptions
+        JSON list of styles with names and descriptions
     """
     logger.debug("Available styles requested")
 
-    return [
-        {"name": style.name, "description": style.description}
-        for style in PREDEFINED_STYLES
-    ]
+    return Response(content=_STYLES_JSON, media_type="application/json")
 
 
 @router.get(
@@ -228,71 +352,148 @@ async def get_available_styles() -> list[dict]:
     description="Check the current status of a meme generation task",
 )
 async def get_task_status(
-    task_id: str,
-    config: ConfigDep,
-) -> TaskStatusResponse:
+    task_id: UUID,
+    result_redis: ResultBackendDep,
+) -> ORJSONResponse:
     """
     Get detailed task status.
 
     Args:
         task_id: Task UUID
-        config: Application configuration (DI)
+        result_redis: Result backend client (DI)
 
     Returns:
-        Detailed information about the task status
+        Detailed information about the task status (TaskStatusResponse shape,
+        serialized directly without model validation)
 
     Raises:
         TaskNotFoundException: If the task is not found
     """
 
+    # Malformed ids are rejected with 422 before reaching the result backend
+    task_id = str(task_id)
     logger.debug("Status check for task", extra={"task_id": task_id})
 
-    task_result = AsyncResult(task_id, app=celery_app)
+    # One backend read; AsyncResult would fetch again for .state/.info/.result
+    meta = await _get_task_meta(task_id, result_redis)
+    state = meta["status"]
+    # Progress dict, return value or exception, depending on the state
+    info = meta.get("result")
 
     # Form response based on status
     response_data = {
         "task_id": task_id,
-        "status": TaskStatus(task_result.state),
+        "status": _STATE_TO_ENUM[state],
+        "progress": None,
+        "result": None,
+        "error": None,
     }
 
-    if task_result.state == TaskStatus.PENDING:
-        response_data["progress"] = TaskProgressInfo(
-            current=0,
-            total=4,
-            status="Task is waiting in the queue",
-        )
+    if state == TaskStatus.PENDING:
+        response_data["progress"] = _PENDING_PROGRESS
         logger.debug("Task is PENDING", extra={"task_id": task_id})
 
-    elif task_result.state == TaskStatus.STARTED:
+    elif state == TaskStatus.STARTED:
         # Extract progress information
-        info = task_result.info if task_result.info else {}
-        response_data["progress"] = TaskProgressInfo(
+        info = info or {}
+        response_data["progress"] = _TaskProgress(
             current=info.get("current", 1),
             total=info.get("total", 4),
             status=info.get("status", "Generation started..."),
         )
         logger.debug("Task is STARTED", extra={"task_id": task_id, "info": info})
 
-    elif task_result.state == TaskStatus.SUCCESS:
-        result_data = task_result.result
-        response_data["result"] = MemeGenerationResult(**result_data)
+    elif state == TaskStatus.SUCCESS:
+        # The worker returns exactly the MemeGenerationResult fields
+        response_data["result"] = info
         logger.info("Task completed successfully", extra={"task_id": task_id})
 
-    elif task_result.state == TaskStatus.FAILURE:
-        error_msg = str(task_result.info)
+    elif state == TaskStatus.FAILURE:
+        error_msg = _error_message(info)
         response_data["error"] = error_msg
         logger.error("Task failed", extra={"task_id": task_id, "error": error_msg})
 
-    elif task_result.state == TaskStatus.RETRY:
-        info = task_result.info if task_result.info else {}
-        response_data["progress"] = TaskProgressInfo(
-            current=0,
-            total=4,
-            status="Retrying generation...",
-        )
+    elif state == TaskStatus.RETRY:
+        response_data["progress"] = _RETRY_PROGRESS
         logger.warning("Task is retrying", extra={"task_id": task_id})
 
-    return TaskStatusResponse(**response_data)
+    return ORJSONResponse(response_data)
+
+
+async def _get_task_meta(task_id: str, result_redis: aioredis.Redis | None) -> dict:
+    """
+    Get task metadata from the result backend, cached for finished tasks.
+
+    With a Redis result backend the celery-task-meta key is read with the
+    async client, so the event loop is not blocked by Celery's sync client.
+
+    Args:
+        task_id: Task UUID
+        result_redis: Async client for the result backend (None to use Celery)
+
+    Returns:
+        Celery task meta dict (status, result, traceback, ...)
+    """
+    entry = _task_meta_cache.get(task_id)
+    if entry is not None:
+        if entry[0] > time.monotonic():
+            return entry[1]
+        del _task_meta_cache[task_id]
+
+    backend = celery_app.backend
+    if result_redis is None:
+        meta = await asyncio.to_thread(backend.get_task_meta, task_id)
+    else:
+        raw = await result_redis.get(backend.get_key_for_task(task_id))
+        if raw is None:
+            # Celery reports unknown task ids as PENDING as well
+            meta = {"status": TaskStatus.PENDING.value, "result": None}
+        else:
+            # Results are JSON (result_serializer). Failures stay as the
+            # serialized exception dict, see _error_message
+            meta = orjson.loads(raw)
+
+    if meta["status"] in _TERMINAL_STATES:
+        _task_meta_cache[task_id] = (time.monotonic() + TASK_META_CACHE_TTL, meta)
+        if len(_task_meta_cache) > TASK_META_CACHE_SIZE:
+            _task_meta_cache.popitem(last=False)
+    return meta
+
+
+def _error_message(result: Any) -> str:
+    """
+    Get the error text of a failed task without rebuilding the exception.
+
+    Args:
+        result: Result of a FAILURE task, either Celery's serialized
+            exception dict (exc_type, exc_message, ...) or an exception
+
+    Returns:
+        Error message, same as str() of the original exception
+    """
+    if isinstance(result, dict) and "exc_message" in result:
+        args = result["exc_message"]
+        if isinstance(args, list | tuple):
+            return str(args[0]) if len(args) == 1 else str(tuple(args))
+        return str(args)
+    return str(result)
+
+
+async def _stat_file(path: str) -> os.stat_result | None:
+    """
+    Stat a file without blocking the event loop.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        stat result for a regular file, None if it is missing or not a file
+    """
+    try:
+        file_stat = await asyncio.to_thread(os.stat, path)
+    except OSError:
+        return None
+    return file_stat if stat.S_ISREG(file_stat.st_mode) else None
 
 
 @router.get(
@@ -302,15 +503,15 @@ async def get_task_status(
     description="Download the generated meme file (only for completed tasks)",
 )
 async def get_meme_result(
-    task_id: str,
-    config: ConfigDep,
+    task_id: UUID,
+    result_redis: ResultBackendDep,
 ) -> FileResponse:
     """
     Get the generated meme file.
 
     Args:
         task_id: Task UUID
-        config: Application configuration (DI)
+        result_redis: Result backend client (DI)
 
     Returns:
         Image file
@@ -321,21 +522,26 @@ async def get_meme_result(
         ImageNotFoundException: If the image file is not found
     """
 
+    task_id = str(task_id)
     logger.debug("Result retrieval for task", extra={"task_id": task_id})
 
-    task_result = AsyncResult(task_id, app=celery_app)
+    meta = await _get_task_meta(task_id, result_redis)
+    state = meta["status"]
 
-    if task_result.state == TaskStatus.SUCCESS:
-        result = task_result.result
+    if state == TaskStatus.SUCCESS:
+        result = meta["result"]
         image_path = result.get("final_image_path")
 
-        if image_path and Path(image_path).exists():
+        file_stat = await _stat_file(image_path) if image_path else None
+        if file_stat is not None:
             logger.info(
                 "Returning image for task",
                 extra={"task_id": task_id, "image_path": image_path},
             )
+            # Pass the stat along so FileResponse does not stat the file again
             return FileResponse(
                 image_path,
+                stat_result=file_stat,
                 filename=Path(image_path).name,
                 headers={
                     "X-Task-ID": task_id,
@@ -348,19 +554,15 @@ async def get_meme_result(
         )
         raise ImageNotFoundException(image_path or "unknown")
 
-    if task_result.state in [
-        TaskStatus.PENDING,
-        TaskStatus.STARTED,
-        TaskStatus.RETRY,
-    ]:
+    if state in _IN_PROGRESS_STATES:
         logger.debug(
             "Task still processing",
-            extra={"task_id": task_id, "state": task_result.state},
+            extra={"task_id": task_id, "state": state},
         )
         raise TaskStillProcessingException(task_id)
 
-    if task_result.state == TaskStatus.FAILURE:
-        error_msg = str(task_result.info)
+    if state == TaskStatus.FAILURE:
+        error_msg = _error_message(meta["result"])
         logger.error(
             "Cannot return result for failed task",
             extra={"task_id": task_id, "error": error_msg},
@@ -369,7 +571,7 @@ async def get_meme_result(
 
     logger.warning(
         "Unknown task state",
-        extra={"task_id": task_id, "state": task_result.state},
+        extra={"task_id": task_id, "state": state},
     )
     raise TaskNotFoundException(task_id)
 
@@ -383,20 +585,31 @@ async def get_tasks_stats():
         Dictionary with task counts by status
     """
 
+    if _task_stats_cache["expires_at"] > time.monotonic():
+        return _task_stats_cache["value"]
+
     inspect = Inspect(app=celery_app)
 
+    # Each call is a blocking broadcast with its own reply timeout,
+    # so run them side by side off the event loop
+    active, reserved, stats = await asyncio.gather(
+        asyncio.to_thread(inspect.active),
+        asyncio.to_thread(inspect.reserved),
+        asyncio.to_thread(inspect.stats),
+    )
+
     # Active tasks
-    active = inspect.active() or {}
+    active = active or {}
     active_count = sum(len(tasks) for tasks in active.values())
 
     # Reserved tasks (in queue)
-    reserved = inspect.reserved() or {}
+    reserved = reserved or {}
     reserved_count = sum(len(tasks) for tasks in reserved.values())
 
     # Worker statistics
-    stats = inspect.stats() or {}
+    stats = stats or {}
 
-    return {
+    result = {
         "active_tasks": active_count,
         "pending_tasks": reserved_count,  # These are tasks in the queue (PENDING)
         "worker_count": len(stats),
@@ -404,3 +617,6 @@ async def get_tasks_stats():
         "active": active,
         "reserved": reserved,
     }
+    _task_stats_cache["value"] = result
+    _task_stats_cache["expires_at"] = time.monotonic() + TASK_STATS_TTL
+    return result
@@ -5,12 +5,28 @@ Follow OOP and data validation principles.
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import ClassVar
+from typing import Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from src.models.meme import PREDEFINED_STYLES
 from src.templates.memes import DEFAULT_HEIGHT, DEFAULT_WIDTH
 
+# Valid style names, validated by Pydantic as a Literal
+STYLE_NAMES = tuple(style.name for style in PREDEFINED_STYLES)
+StyleName = Literal[STYLE_NAMES]
+STYLE_NAMES_TEXT = ", ".join(STYLE_NAMES)
+
+# Upper bound for POST /generate/batch
+MAX_BATCH_SIZE = 20
+
+_UTC = timezone.utc
+
+
+def _utcnow() -> datetime:
+    """Current UTC time, default factory for timestamp fields."""
+    return datetime.now(_UTC)
+
 
 class TaskStatus(str, Enum):
     """Celery task statuses."""
@@ -39,7 +55,7 @@ class MemeGenerationRequest(BaseModel):
         description="Meme description in Russian",
         examples=["cat drinks coffee"],
     )
-    style: str | None = Field(
+    style: StyleName | None = Field(
         None,
         description="Visualization style (optional, random if not specified)",
         examples=["realistic", "anime", "cyberpunk"],
@@ -54,10 +70,40 @@ class MemeGenerationRequest(BaseModel):
             raise ValueError
         return v
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {"user_input": "кот пьет кофе", "style": "realistic"},
-        }
+        },
+    )
+
+
+class MemeGenerationBatchRequest(BaseModel):
+    """
+    Batch of meme generation requests submitted at once.
+
+    Attributes:
+        items: Individual generation requests
+    """
+
+    items: list[MemeGenerationRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="Meme generation requests",
+    )
+
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"user_input": "кот пьет кофе", "style": "realistic"},
+                    {"user_input": "собака на работе"},
+                ],
+            },
+        },
+    )
 
 
 class TaskResponse(BaseModel):
@@ -74,14 +120,29 @@ class TaskResponse(BaseModel):
     status: str = Field(..., description="Task status")
     message: str = Field(..., description="Task information")
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "task_id": "550e8400-e29b-41d4-a716-446655440000",
                 "status": "queued",
                 "message": "Task added to queue",
             },
-        }
+        },
+    )
+
+
+class TaskBatchResponse(BaseModel):
+    """
+    Response to batch task creation.
+
+    Attributes:
+        tasks: Created tasks, in the order of the request items
+    """
+
+    tasks: list[TaskResponse] = Field(..., description="Created tasks")
+
+    model_config = ConfigDict(frozen=True)
 
 
 class TaskProgressInfo(BaseModel):
@@ -91,10 +152,12 @@ class TaskProgressInfo(BaseModel):
     total: int = Field(..., ge=0, description="Total steps")
     status: str = Field(..., description="Current status description")
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {"current": 2, "total": 4, "status": "Generating image..."},
-        }
+        },
+    )
 
 
 class MemeGenerationResult(BaseModel):
@@ -111,8 +174,9 @@ class MemeGenerationResult(BaseModel):
     generation_id: str = Field(..., description="Unique generation ID")
     generated_at: str | None = Field(None, description="Generation time")
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "success": True,
                 "final_image_path": "generated_images/abc123.jpg",
@@ -122,7 +186,8 @@ class MemeGenerationResult(BaseModel):
                 "generation_id": "abc123",
                 "generated_at": "2025-10-27T14:30:00Z",
             },
-        }
+        },
+    )
 
 
 class TaskStatusResponse(BaseModel):
@@ -143,8 +208,9 @@ class TaskStatusResponse(BaseModel):
     result: MemeGenerationResult | None = None
     error: str | None = None
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "task_id": "550e8400-e29b-41d4-a716-446655440000",
                 "status": "SUCCESS",
@@ -157,7 +223,8 @@ class TaskStatusResponse(BaseModel):
                     "generation_id": "abc123",
                 },
             },
-        }
+        },
+    )
 
 
 class HealthResponse(BaseModel):
@@ -166,17 +233,19 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     service: str = Field(..., description="Service name")
     version: str = Field("1.0.0", description="API version")
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = Field(default_factory=_utcnow)
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "service": "memology-ml-api",
                 "version": "1.0.0",
                 "timestamp": "2025-10-27T14:30:00Z",
             },
-        }
+        },
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -184,16 +253,18 @@ class ErrorResponse(BaseModel):
 
     detail: str = Field(..., description="Error description")
     error_code: str | None = Field(None, description="Error code")
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = Field(default_factory=_utcnow)
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "detail": "Image file not found",
                 "error_code": "IMAGE_NOT_FOUND",
                 "timestamp": "2025-10-27T14:30:00Z",
             },
-        }
+        },
+    )
 
 
 class MemegenRequest(BaseModel):
@@ -219,6 +290,8 @@ class MemegenRequest(BaseModel):
         description="Meme height in pixels",
     )
 
+    model_config = ConfigDict(frozen=True)
+
 
 class MemegenResponse(BaseModel):
     """Response schema for memegen.link meme generation"""
@@ -230,11 +303,13 @@ class MemegenResponse(BaseModel):
     )
     text: str = Field(..., description="Text placed on the the meme")
 
-    class Config:
-        json_schema_extra: ClassVar[dict] = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "url": "https://api.memegen.link/images/drake/Дебажить_3_часа/Код_работает_с_первого_раза.png?font=notosans&width=800&height=600",
                 "template": "drake",
                 "text": "Дебажить 3 часа",
             },
-        }
+        },
+    )
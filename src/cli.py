@@ -1,6 +1,5 @@
 import argparse
-
-from main import create_meme_service
+import asyncio
 
 
 def parse_args():
@@ -13,14 +12,24 @@ def parse_args():
 
 def main():
     args = parse_args()
+
+    # Heavy imports (Pillow, requests, ollama) only after the arguments
+    # are valid, so --help and usage errors return immediately
+    from main import create_meme_service, generate_all  # noqa: PLC0415
+
     service = create_meme_service()
-    for i in range(args.count):
-        print(f"Generating meme {i + 1}/{args.count}...")
-        result = service.generate_meme(args.text)
-        if result.success:
-            print(f"✅ Saved: {result.final_image_path}")
-        else:
-            print(f"❌ Error: {result.error_message}")
+    try:
+        # LLM and SD calls are remote I/O, so the memes are generated
+        # concurrently (bounded by OLLAMA_NUM_PARALLEL) instead of one by one
+        print(f"Generating {args.count} meme(s)...")
+        results = asyncio.run(generate_all(service, [args.text] * args.count))
+        for i, result in enumerate(results, start=1):
+            if result.success:
+                print(f"✅ [{i}/{args.count}] Saved: {result.final_image_path}")
+            else:
+                print(f"❌ [{i}/{args.count}] Error: {result.error_message}")
+    finally:
+        service.close()
 
 
 if __name__ == "__main__":
@@ -6,8 +6,13 @@ Supports configuration from logging.ini file and programmatic setup.
 import logging
 import logging.config
 import logging.handlers
+import threading
+from functools import lru_cache
 from pathlib import Path
 
+# Serializes the one-time setup when several threads log at startup
+_CONFIGURE_LOCK = threading.Lock()
+
 
 class LoggingConfigurator:
     """Class for centralized logging configuration."""
@@ -30,6 +35,18 @@ class LoggingConfigurator:
         if cls._configured:
             return
 
+        with _CONFIGURE_LOCK:
+            if cls._configured:
+                return
+            cls._configure_locked(config_file, log_level)
+
+    @classmethod
+    def _configure_locked(
+        cls,
+        config_file: str | None,
+        log_level: str | None,
+    ) -> None:
+        """Performs the configuration; the caller holds _CONFIGURE_LOCK."""
         # Create logs directory if it does not exist
         logs_dir = Path("logs")
         logs_dir.mkdir(exist_ok=True)
@@ -92,10 +109,14 @@ class LoggingConfigurator:
         return logging.getLogger(name)
 
 
+@lru_cache(maxsize=256)
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger.
 
+    Results are cached per name: the first call configures logging if
+    needed, later calls are a single dict lookup.
+
     Args:
         name: Logger name (recommended to use __name__)
 
@@ -4,12 +4,12 @@ Uses environment variables and provides default values.
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OllamaConfig:
     """Configuration for Ollama LLM."""
 
@@ -18,7 +18,7 @@ class OllamaConfig:
     base_url: str = "http://localhost:11434"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StableDiffusionConfig:
     """Configuration for Stable Diffusion WebUI."""
 
@@ -29,25 +29,23 @@ class StableDiffusionConfig:
     sampler: str = "DPM++ 2M Karras"
     cfg_scale: float = 7.0
     restore_faces: bool = True
+    warmup: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """Main application configuration."""
 
     output_dir: str = "generated_images"
     log_file: str = "generation.log"
     font_path: str = "impact.ttf"
-    ollama: OllamaConfig = None
-    stable_diffusion: StableDiffusionConfig = None
-
-    def __post_init__(self):
-        if self.ollama is None:
-            self.ollama = OllamaConfig()
-        if self.stable_diffusion is None:
-            self.stable_diffusion = StableDiffusionConfig()
-        # Create output directory if it doesn't exist
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+    cache_dir: str | None = None
+    cache_max_entries: int = 256
+    llm_cache_size: int = 0
+    ollama: OllamaConfig = field(default_factory=OllamaConfig)
+    stable_diffusion: StableDiffusionConfig = field(
+        default_factory=StableDiffusionConfig,
+    )
 
 
 class ConfigManager:
@@ -80,19 +78,23 @@ class ConfigManager:
                 sampler=os.getenv("SD_SAMPLER", "DPM++ 2M Karras"),
                 cfg_scale=float(os.getenv("SD_CFG_SCALE", "7.0")),
                 restore_faces=os.getenv("SD_RESTORE_FACES", "True") == "True",
+                warmup=os.getenv("SD_WARMUP", "0") in ("1", "True"),
             )
             self._config = AppConfig(
                 output_dir=os.getenv("OUTPUT_DIR", "generated_images"),
                 log_file=os.getenv("LOG_FILE", "generation.log"),
                 font_path=os.getenv("FONT_PATH", "impact.ttf"),
+                cache_dir=os.getenv("MEME_CACHE_DIR") or None,
+                cache_max_entries=int(os.getenv("MEME_CACHE_MAX_ENTRIES", "256")),
+                llm_cache_size=int(os.getenv("LLM_CACHE_SIZE", "0")),
                 ollama=ollama_config,
                 stable_diffusion=sd_config,
             )
+            # Create output directory if it doesn't exist
+            Path(self._config.output_dir).mkdir(parents=True, exist_ok=True)
         return self._config
 
     @property
     def config(self) -> AppConfig:
         """Get the current configuration."""
-        if self._config is None:
-            return self.load_config()
-        return self._config
+        return self._config or self.load_config()
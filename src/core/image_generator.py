@@ -3,16 +3,42 @@ Abstraction for image generation via Stable Diffusion WebUI.
 """
 
 import base64
+import threading
 from abc import ABC, abstractmethod
 from io import BytesIO
 from typing import Any
 
+import orjson
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
 
 from src.config.settings import StableDiffusionConfig
 from src.utils.logger import LoggerManager
 
+DEFAULT_NEGATIVE_PROMPT = (
+    "low quality, blurry, bad anatomy, distorted, extra limbs, "
+    "poorly drawn, text, watermark, signature, logo"
+)
+
+# Request fields that never change between generations
+_PAYLOAD_TEMPLATE: dict[str, Any] = {
+    "negative_prompt": DEFAULT_NEGATIVE_PROMPT,
+    "batch_size": 1,
+    "n_iter": 1,
+    "seed": -1,
+}
+
+# Smallest request that still makes SD WebUI load the checkpoint
+_WARMUP_PAYLOAD: dict[str, Any] = {
+    "prompt": "a",
+    "steps": 1,
+    "width": 64,
+    "height": 64,
+    "batch_size": 1,
+    "n_iter": 1,
+}
+
 
 class BaseImageGenerator(ABC):
     """Abstract base class for image generators."""
@@ -30,6 +56,9 @@ class BaseImageGenerator(ABC):
             Generated image
         """
 
+    def close(self) -> None:  # noqa: B027
+        """Releases resources held by the generator (no-op by default)."""
+
 
 class StableDiffusionGenerator(BaseImageGenerator):
     """Image generator via Stable Diffusion WebUI API."""
@@ -44,6 +73,58 @@ class StableDiffusionGenerator(BaseImageGenerator):
         self.config = config
         self.logger = LoggerManager.get_logger(__name__)
         self.api_url = f"{config.base_url}/sdapi/v1/txt2img"
+        self.session = self._create_session()
+        # Config never changes for the generator's lifetime
+        self._base_payload: dict[str, Any] = {
+            **_PAYLOAD_TEMPLATE,
+            "steps": config.steps,
+            "width": config.width,
+            "height": config.height,
+            "sampler_name": config.sampler,
+            "cfg_scale": config.cfg_scale,
+            "restore_faces": config.restore_faces,
+        }
+        if config.warmup:
+            threading.Thread(
+                target=self._warmup,
+                name="sd-warmup",
+                daemon=True,
+            ).start()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Creates an HTTP session that keeps connections to SD WebUI alive.
+
+        Returns:
+            Session with a pooled adapter mounted for http and https
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
+    def _warmup(self) -> None:
+        """
+        Sends a tiny txt2img request so the model is resident before the
+        first real generation. The result is discarded.
+        """
+        try:
+            response = self.session.post(
+                self.api_url,
+                json=_WARMUP_PAYLOAD,
+                timeout=600,
+            )
+            response.raise_for_status()
+            self.logger.info("SD WebUI warmup finished")
+        except requests.RequestException as e:
+            self.logger.warning("SD WebUI warmup failed: %s", e)
+
+    def close(self) -> None:
+        """Closes the pooled connections to SD WebUI."""
+        self.session.close()
 
     def generate(
         self,
@@ -64,19 +145,23 @@ class StableDiffusionGenerator(BaseImageGenerator):
 
         Raises:
             requests.RequestException: On network request errors
+            orjson.JSONDecodeError: If SD WebUI returns a malformed body
         """
         payload = self._build_payload(prompt, negative_prompt, **kwargs)
 
         try:
-            self.logger.info(f"Generating image with prompt: {prompt[:50]}...")  # noqa: G004
-            response = requests.post(self.api_url, json=payload, timeout=600)
+            self.logger.info("Generating image with prompt: %.50s...", prompt)
+            response = self.session.post(self.api_url, json=payload, timeout=600)
             response.raise_for_status()
 
-            image_base64 = response.json()["images"][0]
+            # The body is ~1 MB of base64 PNG; orjson parses it much faster
+            image_base64 = orjson.loads(response.content)["images"][0]
             image = Image.open(BytesIO(base64.b64decode(image_base64)))
+            # Decode now so the response and base64 buffers can be freed
+            image.load()
 
             self.logger.info("Image generated successfully")
-        except requests.RequestException:
+        except (requests.RequestException, orjson.JSONDecodeError):
             self.logger.exception("Failed to generate image")
             raise
         else:
@@ -99,23 +184,14 @@ class StableDiffusionGenerator(BaseImageGenerator):
         Returns:
             Dictionary with generation parameters
         """
-        default_negative = (
-            "low quality, blurry, bad anatomy, distorted, extra limbs, "
-            "poorly drawn, text, watermark, signature, logo"
-        )
-
-        payload = {
-            "prompt": prompt,
-            "negative_prompt": negative_prompt or default_negative,
-            "steps": kwargs.get("steps", self.config.steps),
-            "width": kwargs.get("width", self.config.width),
-            "height": kwargs.get("height", self.config.height),
-            "sampler_name": kwargs.get("sampler", self.config.sampler),
-            "cfg_scale": kwargs.get("cfg_scale", self.config.cfg_scale),
-            "restore_faces": kwargs.get("restore_faces", self.config.restore_faces),
-            "batch_size": 1,
-            "n_iter": 1,
-            "seed": -1,
-        }
-        (self.logger.info(f"Generated Payload: {payload}"),)
+        payload = self._base_payload.copy()
+        payload["prompt"] = prompt
+        for key in ("steps", "width", "height", "cfg_scale", "restore_faces"):
+            if key in kwargs:
+                payload[key] = kwargs[key]
+        if "sampler" in kwargs:
+            payload["sampler_name"] = kwargs["sampler"]
+        if negative_prompt:
+            payload["negative_prompt"] = negative_prompt
+        self.logger.debug("Generated Payload: %s", payload)
         return payload
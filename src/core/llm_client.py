@@ -3,9 +3,9 @@ Abstraction for working with language models via Ollama.
 """
 
 import os
-import threading
 from abc import ABC, abstractmethod
 
+import httpx
 import ollama
 
 from src.utils.logger import LoggerManager
@@ -19,12 +19,14 @@ class BaseLLMClient(ABC):
         self,
         messages: list[dict[str, str]],
         timeout: int | None = None,
+        options: dict | None = None,
     ) -> str:
         """
         Generates a response based on messages.
         Args:
             messages: List of messages in the format [{"role": "...", "content": "..."}]
             timeout: Execution timeout in seconds
+            options: Model options (e.g. num_predict, temperature)
         Returns:
             Generated text
         """
@@ -33,6 +35,14 @@ class BaseLLMClient(ABC):
 class OllamaClient(BaseLLMClient):
     """Client for interacting with Ollama LLM."""
 
+    # Fail fast when Ollama is down instead of waiting for the full timeout
+    CONNECT_TIMEOUT = 5.0
+    # Retries of failed connection attempts only; a request that reached
+    # Ollama is never sent twice
+    CONNECT_RETRIES = 2
+    # How long Ollama keeps the model loaded after a request
+    KEEP_ALIVE = "5m"
+
     def __init__(self, model: str, default_timeout: int = 15):
         """
         Initializes the Ollama client.
@@ -46,13 +56,17 @@ class OllamaClient(BaseLLMClient):
         self.logger = LoggerManager.get_logger(__name__)
 
         # Configure ollama client with custom host
-        ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-        self.client = ollama.Client(host=ollama_host)  # ← Create client with host
+        self.host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        # One keep-alive client per timeout value; httpx enforces the
+        # timeout on the socket, so a timed out request does not linger
+        self._clients: dict[float, ollama.Client] = {}
+        self.client = self._get_client(default_timeout)
 
     def generate(
         self,
         messages: list[dict[str, str]],
         timeout: int | None = None,
+        options: dict | None = None,
     ) -> str:
         """
         Generates a response via Ollama with timeout support.
@@ -60,6 +74,7 @@ class OllamaClient(BaseLLMClient):
         Args:
             messages: List of messages
             timeout: Timeout (if None, uses default_timeout)
+            options: Ollama model options (e.g. num_predict, temperature)
 
         Returns:
             Generated text
@@ -71,53 +86,41 @@ class OllamaClient(BaseLLMClient):
         timeout = timeout or self.default_timeout
 
         try:
-            response = self._run_with_timeout(
-                lambda: self.client.chat(
-                    model=self.model,
-                    messages=messages,
-                ),
-                timeout,
+            response = self._get_client(timeout).chat(
+                model=self.model,
+                messages=messages,
+                options=options,
+                keep_alive=self.KEEP_ALIVE,
             )
             return response["message"]["content"]
-        except TimeoutError:
+        except httpx.TimeoutException as e:
             self.logger.exception("Timeout error during LLM generation")
-            raise
+            raise TimeoutError(
+                f"LLM generation exceeded {timeout} seconds",
+            ) from e
         except Exception as e:
             self.logger.exception(f"Error during LLM generation: {e}")  # noqa: G004
             raise
 
-    def _run_with_timeout(self, func, timeout: int):
+    def _get_client(self, timeout: float) -> ollama.Client:
         """
-        Executes a function with a time limit.
+        Returns the Ollama client configured with the given timeout.
 
         Args:
-            func: Function to execute
-            timeout: Maximum execution time in seconds
+            timeout: Read/write timeout in seconds
 
         Returns:
-            Result of the function execution
-
-        Raises:
-            TimeoutError: If the function did not finish in time
+            Client with its own httpx connection pool
         """
-        result = [None]
-        exception = [None]
-
-        def target():
-            try:
-                result[0] = func()
-            except Exception as e:
-                exception[0] = e
-
-        thread = threading.Thread(target=target)
-        thread.daemon = True
-        thread.start()
-        thread.join(timeout)
-
-        if thread.is_alive():
-            raise TimeoutError(f"Function execution exceeded {timeout} seconds")
-
-        if exception[0]:
-            raise exception[0]
-
-        return result[0]
+        client = self._clients.get(timeout)
+        if client is None:
+            client = ollama.Client(
+                host=self.host,
+                timeout=httpx.Timeout(
+                    timeout,
+                    connect=min(timeout, self.CONNECT_TIMEOUT),
+                ),
+                transport=httpx.HTTPTransport(retries=self.CONNECT_RETRIES),
+            )
+            client = self._clients.setdefault(timeout, client)
+        return client
@@ -4,10 +4,11 @@ Data models for representing memes and related entities.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from uuid import uuid4
+from functools import partial
+from secrets import token_hex
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MemeStyle:
     """Image style for a meme."""
 
@@ -24,7 +25,8 @@ class MemeGenerationRequest:
 
     user_input: str
     style: MemeStyle | None = None
-    request_id: str = field(default_factory=lambda: uuid4().hex[:8])
+    # 8 hex chars straight from os.urandom, no UUID object needed
+    request_id: str = field(default_factory=partial(token_hex, 4))
     created_at: datetime = field(default_factory=datetime.now)
 
 
@@ -40,6 +42,8 @@ class MemeGenerationResult:
     generation_time: float
     success: bool = True
     error_message: str | None = None
+    # Whether a failed generation may succeed when tried again later
+    retryable: bool = False
 
     def to_log_string(self) -> str:
         """Formats the result for logging."""
@@ -55,7 +59,7 @@ class MemeGenerationResult:
 
 
 # Predefined styles for generation
-PREDEFINED_STYLES = [
+PREDEFINED_STYLES = (
     MemeStyle(
         "anime",
         "anime style, vibrant colors, soft lighting, detailed, 4k render",
@@ -90,4 +94,7 @@ PREDEFINED_STYLES = [
         "pixel_art",
         "pixel art, retro video game vibe, limited palette, crisp edges",
     ),
-]
+)
+
+# Style lookup by name
+STYLES_BY_NAME = {style.name: style for style in PREDEFINED_STYLES}
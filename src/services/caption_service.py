@@ -3,31 +3,50 @@ Service for generating short meme captions.
 """
 
 import re
+import textwrap
+from typing import ClassVar
 
 from src.config.logging_config import get_logger
 from src.core.llm_client import BaseLLMClient
+from src.utils.text_cache import TextCache
+
+# Блоки <think>.*?</think> (нежадный поиск); незакрытый блок (ответ обрезан
+# по num_predict) удаляется до конца текста
+_THINK_BLOCK_RE = re.compile(r"<think>.*?(?:</think>|$)", re.DOTALL | re.IGNORECASE)
 
 
 class CaptionService:
     """Service for generating meme captions in Russian."""
 
-    SYSTEM_PROMPT = """
+    # Dedented so indentation is not sent to the model on every request.
+    # /no_think turns off the model's <think> block, which would otherwise
+    # spend the num_predict budget before the caption starts
+    SYSTEM_PROMPT = textwrap.dedent("""
     Ты — генератор коротких мемных подписей.
     Создавай короткие смешные подписи на русском языке (2–4 слов).
     Используй сарказм, самоиронию, иронию или жизненные ситуации.
     Не упоминай людей, бренды, политику и не используй грубости.
     Отвечай только подписью, без кавычек и пояснений.
-    """  # noqa: RUF001
+    /no_think
+    """).strip()  # noqa: RUF001
+    _SYS_MSG: ClassVar[dict[str, str]] = {"role": "system", "content": SYSTEM_PROMPT}
 
-    def __init__(self, llm_client: BaseLLMClient):
+    # Captions are a few words; the cap stops rambling but leaves room for
+    # a think block if the model ignores /no_think
+    LLM_OPTIONS: ClassVar[dict] = {"num_predict": 512, "temperature": 0.8}
+
+    def __init__(self, llm_client: BaseLLMClient, cache_size: int = 0):
         """
         Initializes the caption service.
 
         Args:
             llm_client: Client for interacting with LLM
+            cache_size: Number of captions to remember per idea text
+                (0 disables the cache)
         """
         self.llm_client = llm_client
         self.logger = get_logger(__name__)
+        self._cache = TextCache(cache_size)
 
     def generate_caption(self, scene_description: str) -> str:
         """
@@ -40,23 +59,41 @@ class CaptionService:
             Short caption in Russian
 
         """
+        cached = self._cache.get(scene_description)
+        if cached is not None:
+            self.logger.info("Reusing cached caption")
+            return cached
+
         self.logger.info("Generating caption")
 
         messages = [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
+            self._SYS_MSG,
             {"role": "user", "content": scene_description},
         ]
 
         try:
-            raw_caption = self.llm_client.generate(messages, timeout=30)
+            raw_caption = self.llm_client.generate(
+                messages,
+                timeout=30,
+                options=self.LLM_OPTIONS,
+            )
             cleaned = self._clean_caption(raw_caption)
-
-            self.logger.info(f"Generated caption: {cleaned}")  # noqa: G004
         except Exception as e:
-            self.logger.exception(f"Error generating caption: {e}")  # noqa: G004
+            self.logger.exception("Error generating caption: %s", e)
+            return self._get_fallback_caption()
+
+        # An answer cut off inside <think> leaves nothing after cleaning
+        if not cleaned:
+            self.logger.warning("LLM returned an empty caption, using fallback")
             return self._get_fallback_caption()
-        else:
-            return cleaned
+
+        self.logger.info("Generated caption: %s", cleaned)
+        self._cache.put(scene_description, cleaned)
+        return cleaned
+
+    def clear_cache(self) -> None:
+        """Drops all cached captions."""
+        self._cache.clear()
 
     def _clean_caption(self, text: str) -> str:
         """
@@ -68,10 +105,10 @@ class CaptionService:
         Returns:
             str: Текст без блоков <think>
         """
-        # Регулярное выражение для поиска <think>.*?</think> (нежадный поиск)
-        pattern = r"<think>.*?</think>"
-        cleaned_text = re.sub(pattern, "", text, flags=re.DOTALL | re.IGNORECASE)
-        return cleaned_text.strip()
+        # Most answers have no tags at all; skip the regex scan for them
+        if "<" not in text:
+            return text.strip()
+        return _THINK_BLOCK_RE.sub("", text).strip()
 
     def _get_fallback_caption(self) -> str:
         """Returns a fallback caption in case of errors."""
@@ -81,10 +118,15 @@ class CaptionService:
 class CaptionForImageService:
     """Service for generating jokes in Russian."""
 
-    SYSTEM_PROMPT = """
+    SYSTEM_PROMPT = textwrap.dedent("""
     Ты — генератор коротких мемных подписей.
     Создавай короткие смешные подписи на русском языке (10 слов).
-    """
+    /no_think
+    """).strip()
+
+    # Captions are one sentence; the cap stops rambling but leaves room for
+    # a think block if the model ignores /no_think
+    LLM_OPTIONS: ClassVar[dict] = {"num_predict": 768, "temperature": 0.8}
 
     def __init__(self, llm_client: BaseLLMClient):
         """
@@ -120,15 +162,23 @@ class CaptionForImageService:
         ]
 
         try:
-            raw_caption = self.llm_client.generate(messages, timeout=60)
+            raw_caption = self.llm_client.generate(
+                messages,
+                timeout=60,
+                options=self.LLM_OPTIONS,
+            )
             cleaned = self._clean_caption(raw_caption)
-
-            self.logger.info(f"Generated caption: {cleaned}")  # noqa: G004
         except Exception as e:
-            self.logger.exception(f"Error generating caption: {e}")  # noqa: G004
+            self.logger.exception("Error generating caption: %s", e)
             return self._get_fallback_caption()
-        else:
-            return cleaned
+
+        # An answer cut off inside <think> leaves nothing after cleaning
+        if not cleaned:
+            self.logger.warning("LLM returned an empty caption, using fallback")
+            return self._get_fallback_caption()
+
+        self.logger.info("Generated caption: %s", cleaned)
+        return cleaned
 
     def _clean_caption(self, text: str) -> str:
         """
@@ -140,10 +190,10 @@ class CaptionForImageService:
         Returns:
             str: Текст без блоков <think>
         """
-        # Регулярное выражение для поиска <think>.*?</think> (нежадный поиск)
-        pattern = r"<think>.*?</think>"
-        cleaned_text = re.sub(pattern, "", text, flags=re.DOTALL | re.IGNORECASE)
-        return cleaned_text.strip()
+        # Most answers have no tags at all; skip the regex scan for them
+        if "<" not in text:
+            return text.strip()
+        return _THINK_BLOCK_RE.sub("", text).strip()
 
     def _get_fallback_caption(self) -> str:
         """Returns a fallback caption in case of errors."""
@@ -3,15 +3,19 @@ Main service for orchestrating meme generation.
 Combines all components for meme creation.
 """
 
+import contextlib
+import hashlib
 import os
 import random
+import shutil
+import tempfile
 import time
-from datetime import datetime, timezone
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from uuid import uuid4
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config.logging_config import get_logger
 from src.core.image_generator import BaseImageGenerator
@@ -41,6 +45,8 @@ class MemeService:
         image_generator: BaseImageGenerator,
         image_utils: ImageUtils,
         output_dir: str = "generated_images",
+        cache_dir: str | None = None,
+        cache_max_entries: int = 256,
     ):
         """
         Initializes the meme service.
@@ -51,6 +57,10 @@ class MemeService:
             image_generator: Image generator
             image_utils: Image utilities
             output_dir: Directory to save results
+            cache_dir: Directory for reusing finished memes of identical
+                requests (None disables the cache)
+            cache_max_entries: Number of cached memes kept; the least
+                recently used ones are deleted beyond it
         """
         self.prompt_service = prompt_service
         self.caption_service = caption_service
@@ -59,8 +69,30 @@ class MemeService:
         self.image_utils = image_utils
         self.output_dir = Path(output_dir)
         self.logger = get_logger(__name__)
+        # Private generator for style picks, independent of the global one
+        self._rng = random.Random()  # noqa: S311
         # Create directory if it does not exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_entries = cache_max_entries
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Upload settings are fixed for the worker's lifetime
+        self._server_api_url = os.getenv("SERVER_API_URL")
+        worker_token = os.getenv("WORKER_SECRET_TOKEN")
+        self._upload_headers = (
+            {"X-Worker-Token": worker_token} if worker_token else None
+        )
+        # Keep-alive session so uploads reuse the connection to the server
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Closes pooled HTTP connections held by the service."""
+        self._http.close()
+        self.image_generator.close()
 
     def generate_meme(
         self,
@@ -82,7 +114,7 @@ class MemeService:
         # Create request
         request = MemeGenerationRequest(
             user_input=user_input,
-            style=style or self._get_random_style(),
+            style=style or self._rng.choice(PREDEFINED_STYLES),
         )
 
         self.logger.info(f"Starting meme generation: {request.request_id}")  # noqa: G004
@@ -90,34 +122,16 @@ class MemeService:
         self.logger.info(f"Style: {request.style.name}")  # noqa: G004
 
         try:
-            # 1. Generate visual prompt
-            visual_prompt = self.prompt_service.generate_visual_prompt(
-                user_input,
-                request.style,
-            )
-
-            # 2. Generate caption
-            caption = self.caption_service.generate_caption(user_input)
-
-            # Generate meme name
-            name = self.name_service.generate_name(visual_prompt)
-
-            # 3. Generate image
-            raw_image = self.image_generator.generate(visual_prompt)
-
-            # 4. Add caption
-            final_image = self.image_utils.add_caption_to_image(raw_image, caption)
-
-            # 5. Save final image
-            final_path = self._generate_filename("final")
-            self.image_utils.save_image(final_image, final_path)
+            # 1-5. Reuse a cached meme or create a new one
+            cached = self._load_from_cache(request)
+            if cached is None:
+                visual_prompt, caption, name, final_path = self._create_meme(request)
+                self._store_in_cache(request, visual_prompt, caption, name, final_path)
+            else:
+                visual_prompt, caption, name, final_path = cached
 
             # 6. Upload on server
-            final_path_on_server = self.upload(
-                request.request_id,
-                final_path,
-                final_image,
-            )
+            final_path_on_server = self.upload(request.request_id, final_path)
 
             # Calculate generation time
             generation_time = time.time() - start_time
@@ -149,56 +163,232 @@ class MemeService:
                 generation_time=generation_time,
                 success=False,
                 error_message=str(e),
+                retryable=self._is_transient(e),
             )
         else:
             return result
 
-    def _get_random_style(self) -> MemeStyle:
-        """Returns a random style from the predefined ones."""
-        return random.choice(PREDEFINED_STYLES)
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """
+        Tells whether a generation error may go away on a later attempt.
+
+        Network failures, timeouts and 5xx/429 answers from SD WebUI or the
+        upload server are transient; anything else (bad input, 4xx, bugs)
+        will fail the same way again.
+        """
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return response is not None and (
+                response.status_code >= 500  # noqa: PLR2004
+                or response.status_code == 429  # noqa: PLR2004
+            )
+        return isinstance(
+            error,
+            (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError),
+        )
+
+    def _create_meme(self, request: MemeGenerationRequest) -> tuple[str, str, str, str]:
+        """
+        Runs the LLM, image generation and captioning steps.
 
-    def _generate_filename(self, suffix: str) -> str:
+        Args:
+            request: Meme generation request
+
+        Returns:
+            Tuple (visual prompt, caption, name, path to the final image)
+
+        The caption only needs the user input, so it is generated while the
+        visual prompt is being written; the name is then generated while
+        Stable Diffusion draws the image.
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="meme") as pool:
+            # 1-2. Generate visual prompt and caption concurrently
+            caption_future = pool.submit(
+                self.caption_service.generate_caption,
+                request.user_input,
+            )
+            visual_prompt = self.prompt_service.generate_visual_prompt(
+                request.user_input,
+                request.style,
+            )
+
+            # Generate meme name while the image is being drawn
+            name_future = pool.submit(self.name_service.generate_name, visual_prompt)
+
+            # 3. Generate image
+            raw_image = self.image_generator.generate(visual_prompt)
+
+            caption = caption_future.result()
+            name = name_future.result()
+
+        # 4. Add caption
+        # The raw image is not used afterwards, so skip the defensive copy
+        final_image = self.image_utils.add_caption_to_image(
+            raw_image,
+            caption,
+            in_place=True,
+        )
+
+        # 5. Save final image
+        final_path = self._generate_filename(request.request_id, "final")
+        self.image_utils.save_image(final_image, final_path)
+
+        return visual_prompt, caption, name, final_path
+
+    def _cache_key(self, request: MemeGenerationRequest) -> str:
+        """Returns the content hash identifying identical requests."""
+        content = f"{request.user_input.strip()}\0{request.style.name}"
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _load_from_cache(
+        self,
+        request: MemeGenerationRequest,
+    ) -> tuple[str, str, str, str] | None:
+        """
+        Looks up a finished meme for an identical request.
+
+        On a hit the cached image is copied to a new file in output_dir.
+
+        Args:
+            request: Meme generation request
+
+        Returns:
+            Same tuple as _create_meme, or None on a cache miss
+        """
+        if self.cache_dir is None:
+            return None
+
+        key = self._cache_key(request)
+        image_path = self.cache_dir / f"{key}.png"
+        meta_path = self.cache_dir / f"{key}.json"
+        if not image_path.exists() or not meta_path.exists():
+            return None
+
+        try:
+            meta = orjson.loads(meta_path.read_bytes())
+            cached = meta["visual_prompt"], meta["caption"], meta["name"]
+            final_path = self._generate_filename(request.request_id, "final")
+            shutil.copyfile(image_path, final_path)
+            # Mark the entry as recently used for _prune_cache
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.logger.warning(f"Ignoring broken cache entry: {key}")  # noqa: G004
+            return None
+
+        self.logger.info(f"Reusing cached meme: {key}")  # noqa: G004
+        return (*cached, final_path)
+
+    def _store_in_cache(  # noqa: PLR0913
+        self,
+        request: MemeGenerationRequest,
+        visual_prompt: str,
+        caption: str,
+        name: str,
+        final_path: str,
+    ) -> None:
+        """Stores a finished meme so identical requests can reuse it."""
+        if self.cache_dir is None:
+            return
+
+        key = self._cache_key(request)
+        meta = {"visual_prompt": visual_prompt, "caption": caption, "name": name}
+        try:
+            # The image goes first: readers treat the meta file as the marker
+            # of a complete entry
+            self._write_cache_file(f"{key}.png", Path(final_path).read_bytes())
+            self._write_cache_file(f"{key}.json", orjson.dumps(meta))
+        except OSError:
+            self.logger.warning(f"Failed to cache meme: {key}")  # noqa: G004
+            return
+
+        self._prune_cache()
+
+    def _write_cache_file(self, name: str, data: bytes) -> None:
+        """Writes a cache file atomically, so readers never see it half-written."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, self.cache_dir / name)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def _prune_cache(self) -> None:
+        """Deletes the least recently used entries beyond cache_max_entries."""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                metas = [
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError:
+            return
+
+        excess = len(metas) - self.cache_max_entries
+        if excess <= 0:
+            return
+
+        metas.sort()
+        for _, meta_path in metas[:excess]:
+            # Meta first, so a concurrent reader sees a miss, not a lone meta
+            for path in (meta_path, meta_path.removesuffix(".json") + ".png"):
+                with contextlib.suppress(OSError):
+                    os.unlink(path)
+        self.logger.info(f"Pruned {excess} cached memes")  # noqa: G004
+
+    def _generate_filename(self, request_id: str, suffix: str) -> str:
         """
         Generates a unique filename.
 
         Args:
+            request_id: ID of the generation request (already unique)
             suffix: Suffix for the name (e.g., "raw" or "final")
 
         Returns:
             Full path to the file
         """
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        unique_id = uuid4().hex[:6]
-        filename = f"meme_{timestamp}_{unique_id}_{suffix}.png"
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+        filename = f"meme_{timestamp}_{request_id}_{suffix}.png"
 
         return str(self.output_dir / filename)
 
-    def upload(self, task_id: str, local_path: str, image) -> str:
-        """Loads an image from memory to the server and returns the path on the server."""
-        server_api_url = os.getenv("SERVER_API_URL")
-        worker_token = os.getenv("WORKER_SECRET_TOKEN")
+    def upload(self, task_id: str, local_path: str) -> str:
+        """
+        Uploads an already saved image to the server.
+
+        The PNG written by save_image is sent as is, so the image is not
+        encoded a second time.
+
+        Args:
+            task_id: Task ID used in the upload URL
+            local_path: Path to the saved image
 
-        if not server_api_url or not worker_token:
+        Returns:
+            Path to the image on the server (local path if upload is disabled)
+        """
+        if not self._server_api_url or self._upload_headers is None:
             self.logger.warning(
                 "SERVER_API_URL or WORKER_SECRET_TOKEN not set. Skipping upload.",
             )
             return local_path
 
-        upload_url = f"{server_api_url}/internal/upload/{task_id}"
-        headers = {"X-Worker-Token": worker_token}
+        upload_url = f"{self._server_api_url}/internal/upload/{task_id}"
 
-        img_byte_arr = BytesIO()
-        image.save(img_byte_arr, format="PNG")
-        img_byte_arr.seek(0)
+        local_file = Path(local_path)
 
         try:
-            files = {"file": (Path(local_path).name, img_byte_arr, "image/png")}
-            response = requests.post(
-                upload_url,
-                headers=headers,
-                files=files,
-                timeout=60,
-            )
+            with local_file.open("rb") as image_file:
+                files = {"file": (local_file.name, image_file, "image/png")}
+                response = self._http.post(
+                    upload_url,
+                    headers=self._upload_headers,
+                    files=files,
+                    timeout=60,
+                )
             response.raise_for_status()
 
             response_data = response.json()
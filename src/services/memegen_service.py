@@ -1,11 +1,39 @@
-import json
+import ast
 import random
 import re
+from collections.abc import Callable
+from typing import ClassVar
+
+import orjson
 
 from src.config.logging_config import get_logger
 from src.services.caption_service import CaptionForImageService
 from src.templates.memes import DEFAULT_HEIGHT, DEFAULT_WIDTH, MEME_TEMPLATES_DATABASE
 
+# Шаблоны для разбора ответа LLM, компилируются один раз
+_CODE_FENCE_OPEN_RE = re.compile(r"^```(?:json)?\s*\n?", re.MULTILINE)
+_CODE_FENCE_CLOSE_RE = re.compile(r"\n?```\s*$", re.MULTILINE)
+_JSON_PREFIX_RE = re.compile(r"^json\s*:?\s*", re.IGNORECASE | re.MULTILINE)
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+_QUOTED_RE = re.compile(r'"(.*?)"')
+
+# Правила экранирования memegen; translate применяет их за один проход,
+# поэтому "_" от пробела не удваивается повторно
+_ENCODE_TABLE = str.maketrans(
+    {
+        "_": "__",
+        "-": "--",
+        "?": "~q",
+        "&": "~a",
+        "%": "~p",
+        "#": "~h",
+        "/": "~s",
+        "\\": "~b",
+        " ": "_",
+        "\n": "~n",
+    },
+)
+
 
 class MemeGenerator:
     """Генератор мемов с использованием memegen.link и LLM"""
@@ -21,10 +49,11 @@ class MemeGenerator:
         self.ollama_url = ollama_url
         self.caption_service = caption_service
         self.logger = get_logger(__name__)
+        self._rng = random.Random()  # noqa: S311
 
     def select_random_template(self) -> dict:
         """Выбирает случайный шаблон из всех 105"""
-        template = random.choice(MEME_TEMPLATES_DATABASE)
+        template = self._rng.choice(MEME_TEMPLATES_DATABASE)
 
         self.logger.info(f"Выбран шаблон: {template['id']}")  # noqa: G004
 
@@ -68,16 +97,11 @@ class MemeGenerator:
 
         def clean_response(text: str) -> str:
             """Очищает ответ от мусора вокруг JSON."""
-            text = re.sub(r"^```(?:json)?\s*\n?", "", text, flags=re.MULTILINE)
+            text = _CODE_FENCE_OPEN_RE.sub("", text)
 
-            text = re.sub(r"\n?```\s*$", "", text, flags=re.MULTILINE)
+            text = _CODE_FENCE_CLOSE_RE.sub("", text)
 
-            text = re.sub(
-                r"^json\s*:?\s*",
-                "",
-                text,
-                flags=re.IGNORECASE | re.MULTILINE,
-            )
+            text = _JSON_PREFIX_RE.sub("", text)
 
             return text.strip()
 
@@ -86,61 +110,74 @@ class MemeGenerator:
 
         # 2. Пробуем стандартный парсинг
         try:
-            result = json.loads(cleaned)
+            result = orjson.loads(cleaned)
             if isinstance(result, list):
                 return [str(line).strip() for line in result]
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
         # 3. Ищем JSON внутри текста (если есть мусор)
-        json_match = re.search(r"\[.*\]", cleaned, re.DOTALL)
+        # Подстрочная проверка дешевле DOTALL-поиска по всему тексту
+        json_match = "[" in cleaned and _JSON_ARRAY_RE.search(cleaned)
         if json_match:
             try:
-                result = json.loads(json_match.group())
+                result = orjson.loads(json_match.group())
                 if isinstance(result, list):
                     return [str(line).strip() for line in result]
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
 
-        # 4. Пробуем заменить одинарные кавычки на двойные (популярная ошибка LLM)
+        # 4. Список в одинарных кавычках (популярная ошибка LLM) разбираем как
+        # литерал Python, не ломая апострофы внутри строк
+        try:
+            result = ast.literal_eval(json_match.group() if json_match else cleaned)
+            if isinstance(result, list):
+                return [str(line).strip() for line in result]
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            pass
+
+        # 5. Пробуем заменить одинарные кавычки на двойные
         fixed_quotes = cleaned.replace("'", '"')
         try:
-            result = json.loads(fixed_quotes)
+            result = orjson.loads(fixed_quotes)
             if isinstance(result, list):
                 return [str(line).strip() for line in result]
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
-        # 5. Fallback: извлекаем строки между кавычками
-        strings = re.findall(r'"(.*?)"', cleaned)
+        # 6. Fallback: извлекаем строки между кавычками
+        strings = _QUOTED_RE.findall(cleaned) if '"' in cleaned else []
         if strings:
             return [s.strip() for s in strings[:10]]  # Лимит на 10 строк
 
-        # 6. Финальный fallback: по новым строкам
+        # 7. Финальный fallback: по новым строкам
         lines = [line.strip() for line in cleaned.split("\n") if line.strip()]
         return lines if lines else []
 
-    def _fallback_generation(self, context: str, template_id: str) -> list[str]:
-        """Простая генерация без LLM (фоллбэк)."""
-
-        if template_id == "buzz":
-            words = context.split()
-            noun = words[0] if words else "Это"
-            return [noun, f"{noun} повсюду 🌍"]
+    @staticmethod
+    def _fallback_buzz(context: str) -> list[str]:
+        words = context.split()
+        noun = words[0] if words else "Это"
+        return [noun, f"{noun} повсюду 🌍"]
 
-        if template_id == "fine":
-            top = context[:40] + "..." if len(context) > 40 else context
-            return [top, "Всё хорошо ☕"]
+    @staticmethod
+    def _fallback_fine(context: str) -> list[str]:
+        top = context[:40] + "..." if len(context) > 40 else context
+        return [top, "Всё хорошо ☕"]
 
-        if template_id == "stonks":
-            return [context[:40], "STONKS 📈"]
+    @staticmethod
+    def _fallback_stonks(context: str) -> list[str]:
+        return [context[:40], "STONKS 📈"]
 
-        if template_id == "rollsafe":
-            return [
-                "Нельзя иметь проблемы\nЕсли их игнорировать",
-                "",
-            ]
+    @staticmethod
+    def _fallback_rollsafe(context: str) -> list[str]:  # noqa: ARG004
+        return [
+            "Нельзя иметь проблемы\nЕсли их игнорировать",
+            "",
+        ]
 
+    @staticmethod
+    def _fallback_default(context: str) -> list[str]:
         # Дефолтный случай: разделяем текст пополам
         words = context.split()
         mid = len(words) // 2
@@ -149,6 +186,19 @@ class MemeGenerator:
             " ".join(words[mid:]) or "",
         ]
 
+    # Шаблоны со своими подписями-заглушками
+    _FALLBACK_HANDLERS: ClassVar[dict[str, Callable[[str], list[str]]]] = {
+        "buzz": _fallback_buzz,
+        "fine": _fallback_fine,
+        "stonks": _fallback_stonks,
+        "rollsafe": _fallback_rollsafe,
+    }
+
+    def _fallback_generation(self, context: str, template_id: str) -> list[str]:
+        """Простая генерация без LLM (фоллбэк)."""
+        handler = self._FALLBACK_HANDLERS.get(template_id, self._fallback_default)
+        return handler(context)
+
     def encode_text(self, text: str) -> str:
         """
         Кодирует текст для URL по правилам memegen
@@ -168,19 +218,7 @@ class MemeGenerator:
         if not text:
             return "_"
 
-        # Экранируем служебные символы
-        text = text.replace("_", "__")
-        text = text.replace("-", "--")
-        text = text.replace("?", "~q")
-        text = text.replace("&", "~a")
-        text = text.replace("%", "~p")
-        text = text.replace("#", "~h")
-        text = text.replace("/", "~s")
-        text = text.replace("\\", "~b")
-
-        # Заменяем пробелы и переносы
-        text = text.replace(" ", "_")
-        return text.replace("\n", "~n")
+        return text.translate(_ENCODE_TABLE)
 
     def generate_meme_url(
         self,
@@ -192,19 +230,10 @@ class MemeGenerator:
     ) -> str:
         """Формирует URL мема"""
         encoded_text = [self.encode_text(text) for text in text_list]
-        n = len(encoded_text)
-        url = [self.BASE_URL, "images", template["id"]]
-
-        for i in range(n):
-            if i + 1 == n:
-                text = encoded_text[i] + ".png"
-                url.append(text)
-                break
-            url.append(encoded_text[i])
-            print(url)
-        url = "/".join(url)
-
-        print(encoded_text)
+        # Без строк memegen отдаёт пустой шаблон по /images/<id>.png
+        url = "/".join(
+            (self.BASE_URL, "images", template["id"], *encoded_text),
+        ) + ".png"
 
         params = []
         if font:
@@ -1,13 +1,22 @@
 import re
+import textwrap
+from typing import ClassVar
 
 from src.config.logging_config import get_logger
 from src.core.llm_client import BaseLLMClient
+from src.utils.text_cache import TextCache
+
+# Блоки <think>.*?</think> (нежадный поиск); незакрытый блок (ответ обрезан)
+# удаляется до конца текста
+_THINK_BLOCK_RE = re.compile(r"<think>.*?(?:</think>|$)", re.DOTALL | re.IGNORECASE)
 
 
 class NameService:
     """Service for generating meme captions in Russian."""
 
-    SYSTEM_PROMPT = """
+    # /no_think turns off the model's <think> block, so the answer starts
+    # with the JSON right away
+    SYSTEM_PROMPT = textwrap.dedent("""
     Ты — генератор коротких названий для мема.
     Создавай короткие смешные подписи на русском языке (2–4 слов).
     Используй сарказм, самоиронию, иронию или жизненные ситуации.
@@ -18,17 +27,22 @@ class NameService:
         "name": "Кофе для кота",
         "tags": ["кофе", "кот", "пьет", "латте", "кофе-кот"]
     }
-    """  # noqa: RUF001
+    /no_think
+    """).strip()  # noqa: RUF001
+    _SYS_MSG: ClassVar[dict[str, str]] = {"role": "system", "content": SYSTEM_PROMPT}
 
-    def __init__(self, llm_client: BaseLLMClient):
+    def __init__(self, llm_client: BaseLLMClient, cache_size: int = 0):
         """
         Initializes the caption service.
 
         Args:
             llm_client: Client for interacting with LLM
+            cache_size: Number of names to remember per scene description
+                (0 disables the cache)
         """
         self.llm_client = llm_client
         self.logger = get_logger(__name__)
+        self._cache = TextCache(cache_size)
 
     def generate_name(self, scene_description: str) -> str:
         """
@@ -41,23 +55,33 @@ class NameService:
             Short name in Russian
 
         """
+        cached = self._cache.get(scene_description)
+        if cached is not None:
+            self.logger.info("Reusing cached name")
+            return cached
+
         self.logger.info("Generating name")
 
         messages = [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
+            self._SYS_MSG,
             {"role": "user", "content": scene_description},
         ]
 
         try:
             raw_caption = self.llm_client.generate(messages, timeout=30)
-            cleaned = raw_caption
-
-            self.logger.info(f"Generated caption: {cleaned}")  # noqa: G004
+            cleaned = self._clean_caption(raw_caption)
         except Exception as e:
             self.logger.exception(f"Error generating caption: {e}")  # noqa: G004
             return self._get_fallback_caption()
-        else:
-            return cleaned
+
+        # An answer cut off inside <think> leaves nothing after cleaning
+        if not cleaned:
+            self.logger.warning("LLM returned an empty name, using fallback")
+            return self._get_fallback_caption()
+
+        self.logger.info(f"Generated caption: {cleaned}")  # noqa: G004
+        self._cache.put(scene_description, cleaned)
+        return cleaned
 
     def _clean_caption(self, text: str) -> str:
         """
@@ -69,10 +93,10 @@ class NameService:
         Returns:
             str: Текст без блоков <think>
         """  # noqa: RUF002
-        # Регулярное выражение для поиска <think>.*?</think> (нежадный поиск)
-        pattern = r"<think>.*?</think>"
-        cleaned_text = re.sub(pattern, "", text, flags=re.DOTALL | re.IGNORECASE)
-        return cleaned_text.strip()
+        # Most answers have no tags at all; skip the regex scan for them
+        if "<" not in text:
+            return text.strip()
+        return _THINK_BLOCK_RE.sub("", text).strip()
 
     def _get_fallback_caption(self) -> str:
         """Returns a fallback caption in case of errors."""
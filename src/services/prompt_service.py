@@ -3,16 +3,26 @@ Service for generating image prompts based on user ideas.
 """
 
 import re
+import textwrap
+from typing import ClassVar
 
 from src.config.logging_config import get_logger
 from src.core.llm_client import BaseLLMClient
 from src.models.meme import MemeStyle
+from src.utils.text_cache import TextCache
+
+# Any character from the Cyrillic and Cyrillic Supplement blocks (includes Ё/ё)
+_CYRILLIC_RE = re.compile(r"[\u0400-\u052F]")
+
+# Блоки <think>.*?</think> (нежадный поиск); незакрытый блок (ответ обрезан)
+# удаляется до конца текста
+_THINK_BLOCK_RE = re.compile(r"<think>.*?(?:</think>|$)", re.DOTALL | re.IGNORECASE)
 
 
 class PromptService:
     """Service for generating visual prompts for images."""
 
-    SYSTEM_PROMPT = """
+    SYSTEM_PROMPT = textwrap.dedent("""
     You are a professional prompt engineer for Stable Diffusion specialized in creating hilarious and funny meme images.
     Your task is to transform user ideas into visually entertaining, absurd, and comedic prompts.
 
@@ -32,17 +42,21 @@ class PromptService:
     - Include dramatic or exaggerated lighting that enhances the humor
     - Never use markdown, colons, explanations, or any meta instructions.
     - The text should be directly usable as a Stable Diffusion prompt and result in a funny, engaging image.
-    """  # noqa: E501
+    """).strip()  # noqa: E501
+    _SYS_MSG: ClassVar[dict[str, str]] = {"role": "system", "content": SYSTEM_PROMPT}
 
-    def __init__(self, llm_client: BaseLLMClient):
+    def __init__(self, llm_client: BaseLLMClient, cache_size: int = 0):
         """
         Initializes the prompt service.
 
         Args:
             llm_client: Client for interacting with LLM
+            cache_size: Number of prompts to remember per idea and style
+                (0 disables the cache)
         """
         self.llm_client = llm_client
         self.logger = get_logger(__name__)
+        self._cache = TextCache(cache_size)
 
     def generate_visual_prompt(
         self,
@@ -61,6 +75,12 @@ class PromptService:
         Returns:
             Ready prompt for Stable Diffusion
         """
+        cache_key = f"{style.name}\0{user_text}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.logger.info("Reusing cached visual prompt")
+            return cached
+
         self.logger.info(f"Generating visual prompt for: {user_text}")  # noqa: G004
 
         messages = self._build_messages(user_text, style)
@@ -70,6 +90,13 @@ class PromptService:
                 raw_prompt = self.llm_client.generate(messages, timeout=60)
                 cleaned = self._clean_prompt(raw_prompt)
 
+                # An answer that was only a <think> block is useless to SD
+                if not cleaned:
+                    self.logger.warning("LLM returned an empty prompt")
+                    if attempt < max_retries:
+                        continue
+                    return self._get_fallback_prompt(user_text, style)
+
                 # Check for Cyrillic characters
                 if self._contains_cyrillic(cleaned):
                     if attempt < max_retries:
@@ -93,18 +120,24 @@ class PromptService:
                     return self._get_fallback_prompt(user_text, style)
             else:
                 self.logger.info(f"Generated prompt: {cleaned[:50]}...")  # noqa: G004
+                self._cache.put(cache_key, cleaned)
                 return cleaned
 
         return self._get_fallback_prompt(user_text, style)
 
     def _build_messages(self, user_text: str, style: MemeStyle) -> list[dict[str, str]]:
-        """Creates a list of messages for the LLM."""
+        """
+        Creates a list of messages for the LLM.
+
+        Static text comes first and the user's idea last, so Ollama can reuse
+        the cached prompt prefix across requests with the same style.
+        """
         return [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
+            self._SYS_MSG,
             {
                 "role": "user",
-                "content": f"Describe this scene in English: {user_text}. "
-                f"Style: {style.description}",
+                "content": f"Style: {style.description}. "
+                f"Describe this scene in English: {user_text}",
             },
         ]
 
@@ -118,14 +151,14 @@ class PromptService:
         Returns:
             str: Текст без блоков <think>
         """  # noqa: RUF002
-        # Регулярное выражение для поиска <think>.*?</think> (нежадный поиск)
-        pattern = r"<think>.*?</think>"
-        cleaned_text = re.sub(pattern, "", text, flags=re.DOTALL | re.IGNORECASE)
-        return cleaned_text.strip()
+        # Most answers have no tags at all; skip the regex scan for them
+        if "<" not in text:
+            return text.strip()
+        return _THINK_BLOCK_RE.sub("", text).strip()
 
     def _contains_cyrillic(self, text: str) -> bool:
         """Checks for Cyrillic characters."""
-        return any("а" <= c.lower() <= "я" for c in text)  # noqa: RUF001
+        return _CYRILLIC_RE.search(text) is not None
 
     def _get_fallback_prompt(self, user_text: str, style: MemeStyle) -> str:
         """Returns a fallback prompt in case of errors."""
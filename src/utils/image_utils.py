@@ -3,6 +3,7 @@ Utilities for working with images: adding text, saving, etc.
 """
 
 import textwrap
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
@@ -10,6 +11,30 @@ from PIL import Image, ImageDraw, ImageFont
 from src.utils.logger import LoggerManager
 
 
+@lru_cache(maxsize=64)
+def _load_font(
+    font_path: str,
+    font_size: int,
+) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """
+    Loads a font once per (path, size) pair.
+
+    Args:
+        font_path: Path to the font file
+        font_size: Font size in points
+
+    Returns:
+        Loaded font, or Pillow's default font if the file is unavailable
+    """
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except OSError:
+        LoggerManager.get_logger(__name__).warning(
+            f"Font not found: {font_path}, using default",  # noqa: G004
+        )
+        return ImageFont.load_default()
+
+
 class ImageUtils:
     """Utilities for image manipulations."""
 
@@ -28,6 +53,8 @@ class ImageUtils:
         image: Image.Image,
         caption: str,
         max_font_size: int | None = None,
+        *,
+        in_place: bool = False,
     ) -> Image.Image:
         """
         Adds a caption to the image in meme style.
@@ -36,15 +63,20 @@ class ImageUtils:
             image: Source image
             caption: Caption text
             max_font_size: Maximum font size (None = auto)
+            in_place: Draw on the given RGB/RGBA image itself instead of a
+                copy; for callers that no longer need the original
 
         Returns:
             Image with caption
         """
         self.logger.info(f"Adding caption to image: {caption}")  # noqa: G004
 
-        # Convert to RGB if needed
-        if image.mode != "RGB":
+        # Convert only modes the caption cannot be drawn on in colour;
+        # RGB and RGBA are copied only when the caller keeps the original
+        if image.mode not in {"RGB", "RGBA"}:
             image = image.convert("RGB")
+        elif not in_place:
+            image = image.copy()
 
         draw = ImageDraw.Draw(image)
 
@@ -56,10 +88,15 @@ class ImageUtils:
         max_height = int(image.height * 0.35)
 
         # Select font size
-        font, lines = self._fit_text(caption, font_size, max_width, max_height, draw)
+        font, lines, text_height = self._fit_text(
+            caption,
+            font_size,
+            max_width,
+            max_height,
+            draw,
+        )
 
         # Calculate position (at the bottom of the image)
-        text_height = self._calculate_text_height(lines, font, draw)
         y_position = image.height - text_height - int(image.height * 0.03)
 
         # Draw text with outline
@@ -75,7 +112,7 @@ class ImageUtils:
         max_height: int,
         draw: ImageDraw.Draw,
         min_font_size: int = 16,
-    ) -> tuple[ImageFont.FreeTypeFont, list]:
+    ) -> tuple[ImageFont.FreeTypeFont, list, int]:
         """
         Selects font size and line breaks for the text.
 
@@ -88,56 +125,73 @@ class ImageUtils:
             min_font_size: Minimum font size
 
         Returns:
-            Tuple (font, list of lines)
+            Tuple (font, list of lines, total text height)
         """
-        font_size = initial_font_size
-
-        while font_size >= min_font_size:
-            try:
-                font = ImageFont.truetype(self.font_path, font_size)
-            except OSError:
-                self.logger.warning(f"Font not found: {self.font_path}, using default")  # noqa: G004
-                font = ImageFont.load_default()
+        # Text size grows with font size, so binary search for the largest
+        # size that fits instead of trying every candidate
+        low, high = min_font_size, initial_font_size
+        best_fit = None
 
-            # Calculate wrap width
-            wrap_width = max(8, int(max_width / (font_size * 0.6)))
-            lines = textwrap.wrap(text, width=wrap_width)
+        while low <= high:
+            font_size = (low + high) // 2
+            font, lines = self._wrap_text(text, font_size, max_width)
 
             # Check sizes
-            text_width = max(
-                draw.textbbox((0, 0), line, font=font)[2] for line in lines
-            )
-            text_height = self._calculate_text_height(lines, font, draw)
+            text_width, text_height = self._measure_lines(lines, font, draw)
 
             if text_width <= max_width and text_height <= max_height:
-                return font, lines
+                best_fit = (font, lines, text_height)
+                low = font_size + 1
+            else:
+                high = font_size - 1
 
-            font_size -= 2
+        if best_fit is not None:
+            return best_fit
 
         # If unable to fit, return minimum size
-        try:
-            font = ImageFont.truetype(self.font_path, min_font_size)
-        except OSError:
-            font = ImageFont.load_default()
+        font, lines = self._wrap_text(text, min_font_size, max_width)
+        return font, lines, self._measure_lines(lines, font, draw)[1]
+
+    def _wrap_text(
+        self,
+        text: str,
+        font_size: int,
+        max_width: int,
+    ) -> tuple[ImageFont.FreeTypeFont, list]:
+        """
+        Loads the font for the given size and wraps the text for it.
 
-        wrap_width = max(8, int(max_width / (min_font_size * 0.6)))
-        lines = textwrap.wrap(text, width=wrap_width)
+        Args:
+            text: Text to place
+            font_size: Font size
+            max_width: Maximum width of the area
 
-        return font, lines
+        Returns:
+            Tuple (font, list of lines)
+        """
+        font = _load_font(self.font_path, font_size)
+        wrap_width = max(8, int(max_width / (font_size * 0.6)))
+        return font, textwrap.wrap(text, width=wrap_width)
 
-    def _calculate_text_height(
+    def _measure_lines(
         self,
         lines: list,
         font: ImageFont.FreeTypeFont,
         draw: ImageDraw.Draw,
-    ) -> int:
-        """Calculates the total height of the text."""
+    ) -> tuple[int, int]:
+        """
+        Measures the wrapped text with one textbbox call per line.
+
+        Returns:
+            Tuple (widest line width, total text height)
+        """
+        max_width = 0
         total_height = 0
         for line in lines:
             bbox = draw.textbbox((0, 0), line, font=font)
-            line_height = bbox[3] - bbox[1]
-            total_height += line_height + 5  # 5px between lines
-        return total_height
+            max_width = max(max_width, bbox[2])
+            total_height += bbox[3] - bbox[1] + 5  # 5px between lines
+        return max_width, total_height
 
     def _draw_text_with_outline(  # noqa: PLR0913
         self,
@@ -169,19 +223,15 @@ class ImageUtils:
             # Center horizontally
             x = (image_width - line_width) / 2
 
-            # Draw black outline
-            for dx in range(-outline_width, outline_width + 1):
-                for dy in range(-outline_width, outline_width + 1):
-                    if dx != 0 or dy != 0:
-                        draw.text(
-                            (x + dx, y + dy),
-                            line,
-                            font=font,
-                            fill="black",
-                        )
-
-            # Draw white text on top
-            draw.text((x, y), line, font=font, fill="white")
+            # Draw white text with a black outline in a single pass
+            draw.text(
+                (x, y),
+                line,
+                font=font,
+                fill="white",
+                stroke_width=outline_width,
+                stroke_fill="black",
+            )
             y += line_height + 5
 
     def save_image(
@@ -189,6 +239,7 @@ class ImageUtils:
         image: Image.Image,
         output_path: str,
         quality: int = 95,
+        compress_level: int = 1,
     ) -> str:
         """
         Saves the image to a file.
@@ -196,7 +247,8 @@ class ImageUtils:
         Args:
             image: Image to save
             output_path: Path to save
-            quality: JPEG quality (1-100)
+            quality: JPEG/WEBP quality (1-100)
+            compress_level: PNG zlib level (0-9); low levels save much faster
 
         Returns:
             Absolute path to the saved file
@@ -204,7 +256,19 @@ class ImageUtils:
         path = Path(output_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        image.save(str(path), quality=quality)
+        # Encoder options that favour speed; the format follows the suffix
+        suffix = path.suffix.lower()
+        if suffix in {".jpg", ".jpeg"}:
+            options = {"quality": quality, "subsampling": 2, "optimize": False}
+            # JPEG has no alpha channel
+            if image.mode == "RGBA":
+                image = image.convert("RGB")
+        elif suffix == ".webp":
+            options = {"quality": quality, "method": 4}
+        else:
+            options = {"compress_level": compress_level}
+
+        image.save(str(path), **options)
         self.logger.info(f"Image saved to: {path.absolute()}")  # noqa: G004
 
         return str(path.absolute())
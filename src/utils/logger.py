@@ -3,7 +3,10 @@ Logging system setup module.
 Centralized logging for all application modules.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import ClassVar
@@ -15,6 +18,7 @@ class LoggerManager:
     """
 
     _loggers: ClassVar[dict] = {}
+    _listeners: ClassVar[list[logging.handlers.QueueListener]] = []
 
     @staticmethod
     def setup_logger(
@@ -39,6 +43,12 @@ class LoggerManager:
             return LoggerManager._loggers[name]
 
         logger = logging.getLogger(name)
+        # Already configured elsewhere (e.g. logging.ini); adding our own
+        # handlers on top would write every record twice
+        if logger.handlers:
+            LoggerManager._loggers[name] = logger
+            return logger
+
         logger.setLevel(level)
         logger.propagate = False
 
@@ -62,11 +72,35 @@ class LoggerManager:
             file_handler = logging.FileHandler(log_file, encoding="utf-8")
             file_handler.setLevel(file_level)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+
+            # Write to the file from a background thread so that
+            # logging calls never block on disk I/O
+            log_queue: queue.Queue = queue.Queue(-1)
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            listener = logging.handlers.QueueListener(
+                log_queue,
+                file_handler,
+                respect_handler_level=True,
+            )
+            LoggerManager._start_listener(listener)
 
         LoggerManager._loggers[name] = logger
         return logger
 
+    @staticmethod
+    def _start_listener(listener: logging.handlers.QueueListener) -> None:
+        """Starts a queue listener and stops it (flushing) on interpreter exit."""
+        if not LoggerManager._listeners:
+            atexit.register(LoggerManager.shutdown)
+        listener.start()
+        LoggerManager._listeners.append(listener)
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stops all queue listeners, flushing pending records to their handlers."""
+        while LoggerManager._listeners:
+            LoggerManager._listeners.pop().stop()
+
     @staticmethod
     def get_logger(name: str) -> logging.Logger:
         """
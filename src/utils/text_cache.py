@@ -0,0 +1,77 @@
+"""
+Small thread-safe LRU cache for LLM answers keyed by input text.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    LRU cache mapping normalized input text to a generated answer.
+
+    Keys are case-folded and whitespace-collapsed, so ideas that differ only
+    in letter case or spacing share one entry.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables the cache)
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Returns the lookup key for a text."""
+        return " ".join(text.casefold().split())
+
+    def get(self, text: str) -> str | None:
+        """
+        Returns the cached answer for a text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Cached answer, or None on a miss or when the cache is disabled
+        """
+        if self.maxsize <= 0:
+            return None
+        key = self.normalize(text)
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, text: str, value: str) -> None:
+        """
+        Stores an answer, evicting the least recently used entry if full.
+
+        Blank answers are not stored, so a bad LLM reply is never reused.
+
+        Args:
+            text: Input text
+            value: Generated answer
+        """
+        if self.maxsize <= 0 or not value.strip():
+            return
+        key = self.normalize(text)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all cached answers."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
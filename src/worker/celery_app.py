@@ -32,10 +32,13 @@ class CeleryConfig:
     )
     broker_connection_retry_on_startup = True
 
-    # Serialization
-    task_serializer = "json"
-    accept_content: ClassVar[list[str]] = ["json"]
+    # Serialization: task messages use msgpack (json still accepted for
+    # messages queued before the switch). Results stay json because the API
+    # reads them straight from Redis with orjson.
+    task_serializer = "msgpack"
+    accept_content: ClassVar[list[str]] = ["msgpack", "json"]
     result_serializer = "json"
+    result_accept_content: ClassVar[list[str]] = ["json"]
 
     # Timezone
     timezone = "UTC"
@@ -52,6 +55,10 @@ class CeleryConfig:
     # Worker settings
     worker_prefetch_multiplier = 1  # Important for GPU tasks - one task at a time
     worker_max_tasks_per_child = 10  # Restart worker after 10 tasks
+    # Also restart a child whose resident memory exceeds this many KiB (~8 GB)
+    worker_max_memory_per_child = int(
+        os.getenv("CELERY_MAX_MEMORY_PER_CHILD", "8000000"),
+    )
     # Task execution - INCREASED for handling long operations (meme generation)
 
     # Task acknowledgement
@@ -60,7 +67,12 @@ class CeleryConfig:
 
     # Result backend settings
     result_expires = 3600  # Results are stored for 1 hour
-    result_persistent = True  # Persistent result storage
+    result_persistent = False  # Results are short-lived and can be regenerated
+    result_backend_always_retry = True  # Retry transient Redis errors
+    # Keep the Redis backend connection healthy between tasks
+    redis_socket_keepalive = True
+    redis_retry_on_timeout = True
+    redis_backend_health_check_interval = 30
 
     # Retry settings
     task_publish_retry = True
@@ -85,7 +97,15 @@ class CeleryConfig:
             routing_key="high_priority",
             priority=10,
         ),
+        Queue("maintenance", Exchange("maintenance"), routing_key="maintenance"),
     )
+
+    # Housekeeping gets its own queue so it never waits behind (or occupies)
+    # a GPU worker slot when workers are started with -Q
+    task_routes: ClassVar[dict] = {
+        "src.worker.tasks.generate_meme_task": {"queue": "default"},
+        "src.worker.tasks.cleanup_old_files": {"queue": "maintenance"},
+    }
     # ===== CELERY BEAT (Periodic Tasks) Configuration =====
     beat_schedule: ClassVar[dict] = {
         # Cleanup old meme files every day at 6:00 AM UTC
@@ -94,7 +114,7 @@ class CeleryConfig:
             "schedule": crontab(hour=6, minute=0),  # Every day at 6:00 AM UTC
             "args": (1,),  # Delete files older than 1 day
             "options": {
-                "queue": "default",
+                "queue": "maintenance",
             },
         },
     }
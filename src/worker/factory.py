@@ -3,6 +3,9 @@ Factory for creating services in the worker.
 Follows the Factory pattern and DI principles.
 """
 
+import atexit
+import threading
+
 from src.config.logging_config import get_logger
 from src.config.settings import ConfigManager
 from src.core.image_generator import StableDiffusionGenerator
@@ -24,6 +27,8 @@ class ServiceFactory:
 
     _config: ConfigManager | None = None
     _meme_service: MemeService | None = None
+    # Reentrant: create_meme_service calls get_config while holding it
+    _lock = threading.RLock()
 
     @classmethod
     def get_config(cls) -> ConfigManager:
@@ -34,8 +39,10 @@ class ServiceFactory:
             Application configuration
         """
         if cls._config is None:
-            cls._config = ConfigManager()
-            logger.info("ConfigManager initialized in worker")
+            with cls._lock:
+                if cls._config is None:
+                    cls._config = ConfigManager()
+                    logger.info("ConfigManager initialized in worker")
         return cls._config
 
     @classmethod
@@ -49,6 +56,15 @@ class ServiceFactory:
         if cls._meme_service is not None:
             return cls._meme_service
 
+        with cls._lock:
+            # Another thread may have finished construction while we waited
+            if cls._meme_service is not None:
+                return cls._meme_service
+            return cls._create_meme_service_locked()
+
+    @classmethod
+    def _create_meme_service_locked(cls) -> MemeService:
+        """Builds the MemeService; the caller holds cls._lock."""
         try:
             # Get configuration (this is AppConfig)
             config_manager = cls.get_config()
@@ -87,9 +103,18 @@ class ServiceFactory:
             logger.info("Creating services (PromptService, CaptionService)...")
 
             # Create services
-            prompt_service = PromptService(llm_client=llm_client)
-            caption_service = CaptionService(llm_client=llm_client)
-            name_service = NameService(llm_client=llm_client)
+            prompt_service = PromptService(
+                llm_client=llm_client,
+                cache_size=config.llm_cache_size,
+            )
+            caption_service = CaptionService(
+                llm_client=llm_client,
+                cache_size=config.llm_cache_size,
+            )
+            name_service = NameService(
+                llm_client=llm_client,
+                cache_size=config.llm_cache_size,
+            )
 
             # Create utilities for working with images
             image_utils = ImageUtils()
@@ -104,6 +129,8 @@ class ServiceFactory:
                 image_generator=image_generator,
                 image_utils=image_utils,
                 output_dir=config.output_dir,
+                cache_dir=config.cache_dir,
+                cache_max_entries=config.cache_max_entries,
             )
 
             logger.info("✅ MemeService created successfully in worker")
@@ -117,8 +144,25 @@ class ServiceFactory:
     @classmethod
     def reset(cls):
         """
-        Reset the factory (for tests or config reload).
+        Reset the factory (for tests, config reload or worker shutdown).
+
+        Closes the pooled connections of the dropped MemeService.
         """
-        cls._config = None
-        cls._meme_service = None
+        with cls._lock:
+            meme_service, cls._meme_service = cls._meme_service, None
+            cls._config = None
+        if meme_service is not None:
+            meme_service.close()
         logger.info("ServiceFactory reset")
+
+    @classmethod
+    def _close_at_exit(cls) -> None:
+        """Closes the current MemeService, if any, when the process exits."""
+        meme_service = cls._meme_service
+        if meme_service is not None:
+            meme_service.close()
+
+
+# A single hook for the whole process: it closes whichever service is current,
+# and does nothing if reset() has already closed and dropped it
+atexit.register(ServiceFactory._close_at_exit)  # noqa: SLF001
@@ -3,20 +3,93 @@ Celery tasks for meme generation.
 Follows OOP principles and asynchronous processing.
 """
 
+import os
 import random
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from celery import Task
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from src.config.logging_config import get_logger
-from src.models.meme import PREDEFINED_STYLES
+from src.core.llm_client import BaseLLMClient
+from src.models.meme import (
+    PREDEFINED_STYLES,
+    STYLES_BY_NAME,
+    MemeGenerationResult,
+    MemeStyle,
+)
+from src.services.meme_service import MemeService
 from src.worker.celery_app import celery_app
 from src.worker.factory import ServiceFactory
 
 logger = get_logger(__name__)
 
+# Per-module generator for style picks; reseeded from os.urandom in every
+# worker child so forked processes (and restarts) do not share one sequence
+_rng = random.Random()  # noqa: S311
+
+
+@worker_process_init.connect
+def warm_up_worker(**_kwargs: Any) -> None:
+    """
+    Builds the meme service as soon as a worker child starts, so the first
+    task after a recycle does not pay for it.
+
+    Loading the Ollama model can take longer than Celery allows for process
+    init, so the LLM request runs in a background thread.
+    """
+    _rng.seed()
+
+    try:
+        service = ServiceFactory.create_meme_service()
+    except Exception:  # noqa: BLE001
+        logger.warning("Worker warmup skipped: MemeService could not be created")
+        return
+
+    threading.Thread(
+        target=_warm_up_llm,
+        args=(service.prompt_service.llm_client,),
+        name="llm-warmup",
+        daemon=True,
+    ).start()
+
+
+def _warm_up_llm(llm_client: BaseLLMClient) -> None:
+    """Sends a one-token request so Ollama loads the model and the pool connects."""
+    try:
+        llm_client.generate(
+            [{"role": "user", "content": "hi"}],
+            options={"num_predict": 1},
+        )
+        logger.info("LLM warmup finished")
+    except Exception as e:  # noqa: BLE001
+        logger.warning("LLM warmup failed: %s", e)
+
+
+@worker_process_shutdown.connect
+def shut_down_worker(**_kwargs: Any) -> None:
+    """
+    Closes service connections before a worker child exits.
+
+    Prefork children leave via os._exit when recycled, so atexit hooks do
+    not run there.
+    """
+    ServiceFactory.reset()
+
+
+class MemeGenerationError(Exception):
+    """Raised when MemeService reports an unsuccessful generation."""
+
+
+class TransientMemeGenerationError(MemeGenerationError):
+    """Raised when a generation failed for a reason a retry may fix."""
+
 
 class MemeGenerationTask(Task):
     """
@@ -24,6 +97,11 @@ class MemeGenerationTask(Task):
     Implements error handling and lifecycle hooks.
     """
 
+    @cached_property
+    def meme_service(self) -> MemeService:
+        """MemeService shared by every run of this task in the worker process."""
+        return ServiceFactory.create_meme_service()
+
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """
         Callback for task failure.
@@ -35,7 +113,9 @@ class MemeGenerationTask(Task):
             kwargs: Keyword arguments
             einfo: Error information"""
         logger.error(
-            f"Task {task_id} failed with exception: {exc}",  # noqa: G004
+            "Task %s failed with exception: %s",
+            task_id,
+            exc,
             exc_info=einfo,
         )
         super().on_failure(exc, task_id, args, kwargs, einfo)
@@ -51,7 +131,8 @@ class MemeGenerationTask(Task):
             kwargs: Keyword arguments
         """
         logger.info(
-            f"Task {task_id} completed successfully",  # noqa: G004
+            "Task %s completed successfully",
+            task_id,
         )
         super().on_success(retval, task_id, args, kwargs)
 
@@ -66,16 +147,55 @@ class MemeGenerationTask(Task):
             kwargs: Keyword arguments
             einfo: Error information"""
         logger.warning(
-            f"Task is being retried due to: {exc}",  # noqa: G004
+            "Task is being retried due to: %s",
+            exc,
         )
         super().on_retry(exc, task_id, args, kwargs, einfo)
 
 
+def _select_style(style_name: str | None, task_id: str) -> MemeStyle:
+    """Returns the named style, or a random one if the name is empty or unknown."""
+    if style_name:
+        style = STYLES_BY_NAME.get(style_name)
+        if style is None:
+            logger.warning(
+                "[%s] Style '%s' not found, using random",
+                task_id,
+                style_name,
+            )
+            style = _rng.choice(PREDEFINED_STYLES)
+    else:
+        style = _rng.choice(PREDEFINED_STYLES)
+    logger.info(
+        "[%s] Selected style: %s",
+        task_id,
+        style.name,
+    )
+    return style
+
+
+def _success_payload(result: MemeGenerationResult) -> dict[str, Any]:
+    """Builds the task result for a successfully generated meme."""
+    return {
+        "success": True,
+        "final_image_path": result.final_image_path,
+        "caption": result.caption,
+        "style": result.request.style.name,
+        "user_input": result.request.user_input,
+        "generation_id": result.request.request_id,
+        "generated_at": datetime.now(tz=timezone.utc).isoformat(),
+    }
+
+
 @celery_app.task(
     base=MemeGenerationTask,
     bind=True,
     name="src.worker.tasks.generate_meme_task",
-    autoretry_for=(Exception,),
+    # Only failures MemeService marks as transient (network errors, timeouts,
+    # 5xx answers) are retried; bad input, 4xx answers and bugs fail at once
+    # instead of holding the GPU for minutes
+    autoretry_for=(TransientMemeGenerationError,),
+    throws=(MemeGenerationError,),
     retry_kwargs={
         "max_retries": 2,
         "countdown": 60,  # 60 seconds between retries
@@ -101,101 +221,72 @@ def generate_meme_task(
         Dictionary with information about the generation result
 
     Raises:
-        Exception: On generation errors (with automatic retry)
+        TransientMemeGenerationError: On transient errors (retried automatically)
+        MemeGenerationError: On permanent generation errors
     """
     task_id = self.request.id
-    logger.info(f"Starting meme generation task - task_id: {task_id}")  # noqa: G004
+    logger.info("Starting meme generation task - task_id: %s", task_id)
     logger.info(
-        f"Input: '{user_input}', Style: '{style_name}' - task_id: {task_id}",  # noqa: G004
+        "Input: '%s', Style: '%s' - task_id: %s",
+        user_input,
+        style_name,
+        task_id,
     )
 
-    try:
-        # Step 1: Initialization
-        self.update_state(
-            state="STARTED",
-            meta={"current": 0, "total": 4, "status": "Initializing services..."},
-        )
-        meme_service = ServiceFactory.create_meme_service()
-        logger.debug(f"MemeService initialized - task_id: {task_id}")  # noqa: G004
-
-        # Step 2: Style selection
-        self.update_state(
-            state="STARTED",
-            meta={
-                "current": 1,
-                "total": 4,
-                "status": "Selecting visualization style...",
-            },
-        )
+    # Step 1: Initialization (instant once the worker is warm)
+    meme_service = self.meme_service
+    logger.debug("MemeService initialized - task_id: %s", task_id)
+
+    # Step 2: Style selection
+    style = _select_style(style_name, task_id)
+
+    # Step 3: Meme generation (main work). Steps 1-2 are instant, so this
+    # is the only progress update worth a result-backend round-trip
+    self.update_state(
+        state="STARTED",
+        meta={
+            "current": 3,
+            "total": 4,
+            "status": "Generating image (this may take ~5 minutes)...",
+        },
+    )
 
-        if style_name:
-            style = next((s for s in PREDEFINED_STYLES if s.name == style_name), None)
-            if style is None:
-                logger.warning(
-                    f"[{task_id}] Style '{style_name}' not found, using random",  # noqa: G004
-                )
-                style = random.choice(PREDEFINED_STYLES)
-        else:
-            style = random.choice(PREDEFINED_STYLES)
-        logger.info(
-            f"[{task_id}] Selected style: {style.name}",  # noqa: G004
-        )
+    result = meme_service.generate_meme(user_input, style=style)
 
-        # Step 3: Prompt generation
-        self.update_state(
-            state="STARTED",
-            meta={
-                "current": 2,
-                "total": 4,
-                "status": f"Generating prompt for style: {style.name}",
-            },
-        )
+    # MemeService has already logged the error; on_retry/on_failure log
+    # the outcome
+    if not result.success:
+        error_msg = result.error_message or "Unknown error"
+        if result.retryable:
+            raise TransientMemeGenerationError(error_msg)
+        raise MemeGenerationError(error_msg)
 
-        # Step 4: Meme generation (main work)
-        self.update_state(
-            state="STARTED",
-            meta={
-                "current": 3,
-                "total": 4,
-                "status": "Generating image (this may take ~5 minutes)...",
-            },
-        )
+    logger.info(
+        "[%s] Meme generated successfully: id=%s, path=%s",
+        task_id,
+        result.request.request_id,
+        result.final_image_path,
+    )
 
-        result = meme_service.generate_meme(user_input, style=style)
+    # Form the result
+    return _success_payload(result)
 
-        if not result.success:
-            error_msg = result.error_message or "Unknown error"
-            logger.error(
-                f"Generation failed: {error_msg} - task_id: {task_id}",  # noqa: G004
-            )
-            raise Exception(f"Generation error: {error_msg}")  # noqa: TRY002, TRY003, TRY301
 
-        # Step 5: Finalization
-        self.update_state(
-            state="STARTED",
-            meta={"current": 4, "total": 4, "status": "Finalizing..."},
-        )
-        logger.info(
-            f"[{task_id}] Meme generated successfully: "  # noqa: G004
-            f"id={result.request.request_id}, path={result.final_image_path}",
-        )
+# Parallel unlink calls in cleanup_old_files_task
+CLEANUP_WORKERS = 8
+# Every format ImageUtils.save_image can write
+CLEANUP_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
 
-        # Form the result
-        return {
-            "success": True,
-            "final_image_path": result.final_image_path,
-            "caption": result.caption,
-            "style": style.name,
-            "user_input": user_input,
-            "generation_id": result.request.request_id,
-            "generated_at": datetime.now(tz=timezone.utc).isoformat(),
-        }
-
-    except Exception:
-        logger.exception(
-            f"Error in meme generation task - task_id: {task_id}",  # noqa: G004
-        )
-        raise  # Celery automatically retry
+
+def _delete_file(path: str) -> bool:
+    """Deletes a file, logging failures; returns whether it was removed."""
+    try:
+        os.unlink(path)
+    except OSError as e:
+        logger.warning("Failed to delete %s: %s", path, e)
+        return False
+    logger.debug("Deleted old file: %s", path)
+    return True
 
 
 # Additional task for cleaning up old files (optional)
@@ -208,33 +299,38 @@ def cleanup_old_files_task(days_old: int = 1) -> dict[str, int] | None:
         days_old: Delete files older than N days
     """
     logger.info(
-        f"Starting cleanup of files older than {days_old} days",  # noqa: G004
+        "Starting cleanup of files older than %s days",
+        days_old,
     )
 
     output_dir = Path("generated_images")
     if not output_dir.exists():
         return None
 
-    cutoff_time = datetime.now(tz=timezone.utc) - timedelta(days=days_old)
-    deleted_count = 0
+    # Compare raw mtimes (seconds since the epoch) instead of building
+    # a datetime for every file
+    cutoff_ts = time.time() - days_old * 86400
+
+    # scandir yields plain DirEntry objects: no Path wrapper or glob matching
+    # per file, and the file type comes from the directory listing itself
+    with os.scandir(output_dir) as entries:
+        victims = [
+            entry.path
+            for entry in entries
+            if entry.name.lower().endswith(CLEANUP_EXTENSIONS)
+            and entry.is_file()
+            and entry.stat().st_mtime < cutoff_ts
+        ]
+
+    # unlink releases the GIL; on network volumes the round-trips overlap
+    with ThreadPoolExecutor(
+        max_workers=CLEANUP_WORKERS,
+        thread_name_prefix="cleanup",
+    ) as pool:
+        deleted_count = sum(pool.map(_delete_file, victims))
 
-    for file_path in output_dir.glob("*.png"):
-        file_mtime = datetime.fromtimestamp(
-            file_path.stat().st_mtime,
-            tz=timezone.utc,
-        )
-        if file_mtime < cutoff_time:
-            try:
-                file_path.unlink()
-                deleted_count += 1
-                logger.debug(
-                    f"Deleted old file: {file_path}",  # noqa: G004
-                )
-            except Exception as e:
-                logger.exception(
-                    f"Failed to delete {file_path}: {e}",  # noqa: G004, TRY401
-                )
     logger.info(
-        f"Cleanup completed: {deleted_count} files deleted",  # noqa: G004
+        "Cleanup completed: %s files deleted",
+        deleted_count,
     )
     return {"deleted_count": deleted_count}